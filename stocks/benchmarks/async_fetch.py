@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import config
+import scrappers.investing as inv
+from scrappers.investing import aio
+from scrappers.investing.fetchers import HttpFetcher, ReplayFetcher
+from server import serve
+
+def fetcher(origin):
+    http = HttpFetcher(origin)
+    # the statements cache would hide the fetcher
+    http.cacheable = False
+    return http
+
+parser = argparse.ArgumentParser(description="Compare sequential and concurrent loading against a local stand-in server")
+parser.add_argument("path", help="Folder of pages saved with --record or generated by benchmarks/fixtures.py")
+parser.add_argument("-n", "--count", type=int, default=20, help="Number of equities to load")
+parser.add_argument("-d", "--delay", type=float, default=0.2, help="Latency of each response, in seconds")
+parser.add_argument("-c", "--concurrency", type=int, default=16, help="Maximum number of pages fetched at once")
+args = parser.parse_args()
+
+# the served pages are fixtures, not figures to keep in the history
+config.history = False
+# the scheduler and the connection pool would hold the concurrent loads to the default
+config.host_concurrency = args.concurrency
+
+server = serve(args.path, delay=args.delay)
+ISINs = ReplayFetcher(args.path).ISINs()[:args.count]
+
+start = time.perf_counter()
+inv.Equity(ISINs[0], fetcher(server.origin)).load()
+sequential = time.perf_counter() - start
+
+start = time.perf_counter()
+asyncio.run(inv.Equity(ISINs[0], fetcher(server.origin)).load_async())
+concurrent = time.perf_counter() - start
+print("one equity: sequential {:.2f}s, concurrent {:.2f}s (response latency {:.2f}s)".format(sequential, concurrent, args.delay))
+
+async def load_all():
+    failures = 0
+    async for ISIN, equity, error in aio.load_equities(ISINs, concurrency=args.concurrency, fetcher=fetcher(server.origin)):
+        failures += error is not None
+    return failures
+
+start = time.perf_counter()
+for ISIN in ISINs:
+    inv.Equity(ISIN, fetcher(server.origin)).load()
+sequential = time.perf_counter() - start
+
+start = time.perf_counter()
+failures = asyncio.run(load_all())
+concurrent = time.perf_counter() - start
+print("{} equities: sequential {:.2f}s, concurrent {:.2f}s ({} failed)".format(len(ISINs), sequential, concurrent, failures))
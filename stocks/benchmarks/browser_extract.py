@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import numpy as np
+
+from scrappers.investing import extract
+from scrappers.investing import fetchers
+from scrappers.investing import index
+from scrappers.investing.fetchers import ReplayFetcher
+
+pages = ["income-statement", "balance-sheet", "cash-flow", "ratios"]
+
+def emulate(html, page):
+    # what table_script sends back, computed from the recorded page when there is no browser
+    document = extract.document(html)
+    element = document.xpath("//table[@id='rrTable']" if page == "ratios" else "//div[@id='rrtable']//table")[0]
+    name = document.xpath("//section[@id='leftColumn']/div[contains(concat(' ', @class, ' '), ' instrumentHead ')]/h1")
+    price = document.xpath("//*[@id='last_last']")
+    result = {"name": name[0].text_content().strip(), "price": price[0].text_content().strip(), "headers": None, "labels": [], "cells": []}
+    for row in element.iter("tr"):
+        cells = [cell for cell in row if cell.tag in ("th", "td")]
+        if not cells or any(cell.get("colspan") for cell in cells):
+            continue
+        if all(cell.tag == "th" for cell in cells):
+            if result["headers"] is None:
+                result["headers"] = [cell.text_content().strip() for cell in cells[1:]]
+            continue
+        result["labels"].append(cells[0].text_content().strip())
+        result["cells"].append([cell.text_content().strip() for cell in cells[1:]])
+    return result
+
+def url(origin, ISIN, page):
+    # the recorded pages already hold the annual tables
+    return "{}{}-{}".format(origin, urlsplit(index.find(ISIN)["Url"]).path, page)
+
+def from_page_source(html, page):
+    document = extract.document(html)
+    return extract.ratios(document) if page == "ratios" else extract.statement(document)
+
+def from_cells(result, page):
+    cells = extract.document(extract.Cells(result["name"], result["price"], result["headers"], result["labels"], result["cells"]))
+    return extract.ratios(cells) if page == "ratios" else extract.statement(cells)
+
+def measure(function, items):
+    start = time.process_time()
+    for item in items:
+        function(*item)
+    cpu = time.process_time() - start
+    tracemalloc.start()
+    for item in items:
+        function(*item)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return cpu, peak
+
+def same(a, b):
+    return a[0] == b[0] and a[1] == b[1] and np.array_equal(a[2], b[2], equal_nan=True)
+
+parser = argparse.ArgumentParser(description="Page source compared to the table cells read in the browser: bytes transferred, parse cpu and memory")
+parser.add_argument("path", help="Folder of pages saved with --record or generated by benchmarks/fixtures.py")
+parser.add_argument("-n", "--count", type=int, default=20, help="Number of equities")
+parser.add_argument("--browser", action="store_true", help="Load the pages in chrome from a local stand-in server instead of emulating the browser")
+args = parser.parse_args()
+
+ISINs = ReplayFetcher(args.path).ISINs()[:args.count]
+sources = []
+results = []
+transfer = {"page_source": 0.0, "cells": 0.0}
+if args.browser:
+    from scrappers.investing.driver import driver
+    from server import serve
+
+    server = serve(args.path)
+    for ISIN in ISINs:
+        for page in pages:
+            driver.get(url(server.origin, ISIN, page))
+            start = time.perf_counter()
+            sources.append((driver.page_source, page))
+            transfer["page_source"] += time.perf_counter() - start
+            start = time.perf_counter()
+            results.append((driver.execute_script(fetchers.table_script, fetchers.selectors[page]), page))
+            transfer["cells"] += time.perf_counter() - start
+    driver.quit()
+else:
+    replay = ReplayFetcher(args.path)
+    for ISIN in ISINs:
+        for page in pages:
+            html = replay.fetch(ISIN, page, None)
+            sources.append((html, page))
+            results.append((emulate(html, page), page))
+
+mismatches = sum(not same(from_page_source(*source), from_cells(*result)) for source, result in zip(sources, results))
+source_bytes = sum(len(html.encode("utf-8")) for html, _ in sources)
+cells_bytes = sum(len(json.dumps(result).encode("utf-8")) for result, _ in results)
+print("pages: {}, mismatches: {}{}".format(len(sources), mismatches, "" if args.browser else " (browser emulated)"))
+print("transferred: page source {:.1f}KB/page, cells {:.1f}KB/page ({:.0f}x less)".format(
+    source_bytes / 1024 / len(sources), cells_bytes / 1024 / len(sources), source_bytes / cells_bytes))
+if args.browser:
+    print("transfer time: page source {:.1f}ms/page, cells {:.1f}ms/page".format(
+        transfer["page_source"] * 1e3 / len(sources), transfer["cells"] * 1e3 / len(sources)))
+source_cpu, source_peak = measure(from_page_source, sources)
+cells_cpu, cells_peak = measure(from_cells, results)
+print("python side: page source {:.2f}ms/page, {:.0f}KB allocated at peak; cells {:.2f}ms/page, {:.0f}KB allocated at peak".format(
+    source_cpu * 1e3 / len(sources), source_peak / 1024, cells_cpu * 1e3 / len(sources), cells_peak / 1024))
@@ -0,0 +1,40 @@
+import argparse
+import os
+import sys
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import config
+from scrappers.investing import index
+from scrappers.investing.driver import driver
+from scrappers.investing.fetchers import ReplayFetcher, SeleniumFetcher
+from server import serve
+
+pages = ["income-statement", "balance-sheet", "cash-flow", "ratios"]
+
+parser = argparse.ArgumentParser(description="Page load time and bytes transferred by chrome, with the full and the lean browser profile")
+parser.add_argument("path", help="Folder of pages saved with --record or generated by benchmarks/fixtures.py")
+parser.add_argument("-n", "--count", type=int, default=10, help="Number of equities")
+parser.add_argument("-d", "--delay", type=float, default=0.05, help="Latency of each response, in seconds")
+args = parser.parse_args()
+
+config.measure_loads = True
+server = serve(args.path, delay=args.delay)
+ISINs = ReplayFetcher(args.path).ISINs()[:args.count]
+
+for lean in (False, True):
+    config.lean_browser = lean
+    fetcher = SeleniumFetcher()
+    requests = server.requests
+    for ISIN in ISINs:
+        for page in pages:
+            # the recorded pages already hold the annual tables
+            fetcher.fetch(ISIN, page, "{}{}-{}".format(server.origin, urlsplit(index.find(ISIN)["Url"]).path, page))
+    # the browser is started again with the other profile
+    driver.quit()
+    print("{} profile: {} requests to the server".format("lean" if lean else "full", server.requests - requests))
+    for page, summary in fetcher.load_summary().items():
+        times, sizes = summary["time"], summary["bytes"]
+        print("  {}: load p50 {:.0f}ms, p95 {:.0f}ms, transferred p50 {:.1f}KB, p95 {:.1f}KB".format(
+            page, times["p50"] * 1e3, times["p95"] * 1e3, sizes["p50"] / 1024, sizes["p95"] / 1024))
@@ -0,0 +1,91 @@
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from memory import peak_memory
+from scrappers.investing import extract
+from scrappers.investing.fetchers import ReplayFetcher
+
+pages = {"income-statement": "div#rrtable", "balance-sheet": "div#rrtable", "cash-flow": "div#rrtable", "ratios": "table#rrTable"}
+
+def bs4_read_html(html, selector):
+    # the previous path: parse the whole page, serialize the table and parse it again
+    soup = BeautifulSoup(html, "html.parser")
+    div = soup.select_one(selector)
+    return pd.read_html(io.StringIO(str(div)))[0]
+
+def lxml_extract(html, selector):
+    document = extract.document(html)
+    return extract.ratios(document) if selector == "table#rrTable" else extract.statement(document)
+
+methods = {"bs4": bs4_read_html, "lxml": lxml_extract}
+
+# reference run that only loads the pages, its peak memory is subtracted from the others
+def noop(html, selector):
+    pass
+
+def load(path, count):
+    fetcher = ReplayFetcher(path)
+    result = []
+    for ISIN in fetcher.ISINs()[:count]:
+        for page, selector in pages.items():
+            result.append((fetcher.fetch(ISIN, page, None), selector))
+    return result
+
+def same(html, selector):
+    table = bs4_read_html(html, selector)
+    labels, headers, values = lxml_extract(html, selector)
+    # the previous path kept the label column, and a two rows header on some pages
+    table = table.set_index(table.columns[0])
+    if isinstance(table.columns, pd.MultiIndex):
+        table.columns = table.columns.get_level_values(0)
+    table = table.apply(lambda column: pd.to_numeric(column.astype(str).str.replace(",", "").str.rstrip("%"), errors="coerce"))
+    table = table.dropna(how="all")
+    kept = ~np.isnan(values).all(axis=1)
+    return list(table.index) == [label for label, keep in zip(labels, kept) if keep] \
+        and list(table.columns) == headers and np.allclose(table.values, values[kept], equal_nan=True)
+
+def run(method, documents):
+    function = methods.get(method, noop)
+    start = time.process_time()
+    for html, selector in documents:
+        function(html, selector)
+    cpu = time.process_time() - start
+    return {"cpu": cpu, "maxrss": peak_memory()}
+
+parser = argparse.ArgumentParser(description="Compare the lxml table extractor with BeautifulSoup + read_html")
+parser.add_argument("path", help="Folder of pages saved with --record or generated by benchmarks/fixtures.py")
+parser.add_argument("-n", "--count", type=int, default=20, help="Number of equities to parse")
+parser.add_argument("--method", choices=list(methods) + ["none"], help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+documents = load(args.path, args.count)
+if not documents:
+    sys.exit("No recorded pages under {}".format(args.path))
+
+if args.method:
+    # child process: measure one method in isolation so that peak memory is its own
+    print(json.dumps(run(args.method, documents)))
+    sys.exit(0)
+
+mismatches = sum(not same(html, selector) for html, selector in documents)
+print("pages: {}, mismatches: {}".format(len(documents), mismatches))
+
+results = {}
+for method in ["none"] + list(methods):
+    output = subprocess.run([sys.executable, __file__, args.path, "-n", str(args.count), "--method", method], capture_output=True, text=True, check=True).stdout
+    results[method] = json.loads(output)
+for method in methods:
+    print("{:<5} cpu {:.1f}ms/page  peak memory +{:.1f}MB".format(
+        method, results[method]["cpu"] * 1e3 / len(documents), (results[method]["maxrss"] - results["none"]["maxrss"]) / 1024))
+print("speedup: {:.1f}x".format(results["bs4"]["cpu"] / results["lxml"]["cpu"]))
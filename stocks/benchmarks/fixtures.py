@@ -0,0 +1,159 @@
+import argparse
+import gzip
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from scrappers.investing import fetchers
+from scrappers.investing import index
+
+# synthetic pages mimicking the markup of investing.com, used when no recorded pages are available
+
+income_statement_rows = [
+    "Total Revenue", "Revenue", "Other Revenue, Total", "Cost of Revenue, Total", "Gross Profit",
+    "Total Operating Expenses", "Selling/General/Admin. Expenses, Total", "Research & Development",
+    "Depreciation / Amortization", "Interest Expense (Income) - Net Operating", "Unusual Expense (Income)",
+    "Other Operating Expenses, Total", "Operating Income", "Interest Income (Expense), Net Non-Operating",
+    "Gain (Loss) on Sale of Assets", "Other, Net", "Net Income Before Taxes", "Provision for Income Taxes",
+    "Net Income After Taxes", "Minority Interest", "Equity In Affiliates", "U.S GAAP Adjustment",
+    "Net Income Before Extraordinary Items", "Total Extraordinary Items", "Net Income",
+    "Total Adjustments to Net Income", "Income Available to Common Excluding Extraordinary Items",
+    "Dilution Adjustment", "Diluted Net Income", "Diluted Weighted Average Shares",
+    "Diluted EPS Excluding Extraordinary Items", "DPS - Common Stock Primary Issue", "Diluted Normalized EPS",
+]
+
+balance_sheet_rows = [
+    "Total Current Assets", "Cash and Short Term Investments", "Cash", "Cash & Equivalents",
+    "Short Term Investments", "Total Receivables, Net", "Accounts Receivables - Trade, Net", "Total Inventory",
+    "Prepaid Expenses", "Other Current Assets, Total", "Total Assets", "Property/Plant/Equipment, Total - Net",
+    "Property/Plant/Equipment, Total - Gross", "Accumulated Depreciation, Total", "Goodwill, Net",
+    "Intangibles, Net", "Long Term Investments", "Note Receivable - Long Term", "Other Long Term Assets, Total",
+    "Other Assets, Total", "Total Current Liabilities", "Accounts Payable", "Payable/Accrued",
+    "Accrued Expenses", "Notes Payable/Short Term Debt", "Current Port. of LT Debt/Capital Leases",
+    "Other Current liabilities, Total", "Total Liabilities", "Total Long Term Debt", "Long Term Debt",
+    "Capital Lease Obligations", "Deferred Income Tax", "Minority Interest", "Other Liabilities, Total",
+    "Total Equity", "Redeemable Preferred Stock, Total", "Preferred Stock - Non Redeemable, Net",
+    "Common Stock, Total", "Additional Paid-In Capital", "Retained Earnings (Accumulated Deficit)",
+    "Treasury Stock - Common", "Other Equity, Total", "Total Liabilities & Shareholders' Equity",
+    "Total Common Shares Outstanding", "Total Preferred Shares Outstanding",
+]
+
+cash_flow_rows = [
+    "Net Income/Starting Line", "Cash From Operating Activities", "Depreciation/Depletion", "Amortization",
+    "Deferred Taxes", "Non-Cash Items", "Cash Receipts", "Cash Payments", "Cash Taxes Paid", "Cash Interest Paid",
+    "Changes in Working Capital", "Cash From Investing Activities", "Capital Expenditures",
+    "Other Investing Cash Flow Items, Total", "Cash From Financing Activities", "Financing Cash Flow Items",
+    "Total Cash Dividends Paid", "Issuance (Retirement) of Stock, Net", "Issuance (Retirement) of Debt, Net",
+    "Foreign Exchange Effects", "Net Change in Cash", "Beginning Cash Balance", "Ending Cash Balance",
+    "Free Cash Flow", "Free Cash Flow Growth", "Free Cash Flow Yield",
+]
+
+ratios_rows = [
+    "P/E Ratio TTM", "Price to Sales TTM", "Price to Cash Flow MRQ", "Price to Free Cash Flow TTM",
+    "Price to Book MRQ", "Price to Tangible Book MRQ", "Gross margin TTM", "Gross Margin 5YA",
+    "Operating margin TTM", "Operating margin 5YA", "Pretax margin TTM", "Pretax margin 5YA",
+    "Net Profit margin TTM", "Net Profit margin 5YA", "Revenue/share TTM", "Basic EPS ANN", "Diluted EPS ANN",
+    "Book value/share MRQ", "Tangible book value/share MRQ", "Cash/share MRQ", "Cash flow/share TTM",
+    "Return on Equity TTM", "Return on Equity 5YA", "Return on Assets TTM", "Return on Assets 5YA",
+    "Return on Investment TTM", "Return on Investment 5YA", "EPS(MRQ) vs Qtr. 1 Yr. Ago MRQ",
+    "EPS(TTM) vs TTM 1 Yr. Ago TTM", "5 Year EPS Growth 5YA", "Sales (MRQ) vs Qtr. 1 Yr. Ago MRQ",
+    "Sales (TTM) vs TTM 1 Yr. Ago TTM", "5 Year Sales Growth 5YA", "5 Year Capital Spending Growth 5YA",
+    "Quick Ratio MRQ", "Current Ratio MRQ", "LT Debt to Equity MRQ", "Total Debt to Equity MRQ",
+    "Asset Turnover TTM", "Inventory Turnover TTM", "Revenue/Employee TTM", "Net Income/Employee TTM",
+    "Receivable Turnover TTM", "Dividend Yield ANN", "Dividend Yield 5 Year Avg. 5YA",
+    "Dividend Growth Rate ANN", "Payout Ratio TTM",
+]
+
+def filler(random_generator, size):
+    # ads, trackers and scripts surrounding the table on the real pages
+    chunks = []
+    length = 0
+    while length < size:
+        chunk = "<div class=\"ad\" id=\"ad{}\"><script>window.dataLayer.push({{'event': '{}'}});</script><img src=\"/img/{}.png\"></div>\n".format(
+            random_generator.randrange(10**6), random_generator.randrange(10**9), random_generator.randrange(10**6))
+        chunks.append(chunk)
+        length += len(chunk)
+    return "".join(chunks)
+
+def head(equity, price, random_generator, filler_size):
+    return "<html><head><title>{0}</title><script>{1}</script></head><body>\n{2}<section id=\"leftColumn\"><div class=\"instrumentHead\"><h1>{0} ({3})</h1></div>\n<div class=\"top bold inlineblock\"><span class=\"arial_26 inlineblock pid-{4}-last\" id=\"last_last\" dir=\"ltr\">{5:,.2f}</span></div>\n".format(
+        equity["Symbol"].title() + " SA", "var x = 1;" * (filler_size // 20), filler(random_generator, filler_size // 2), equity["Symbol"], equity["PID"], price)
+
+def tail(random_generator, filler_size):
+    return "</section>\n{}</body></html>".format(filler(random_generator, filler_size // 2))
+
+def value(random_generator, scale):
+    draw = random_generator.random()
+    if draw < 0.05:
+        return "-"
+    sign = -1 if draw > 0.95 else 1
+    return "{:.2f}".format(sign * random_generator.uniform(0.5, 1) * scale)
+
+def statement(equity, price, rows, years, random_generator, filler_size, length_header=False):
+    html = [head(equity, price, random_generator, filler_size)]
+    html.append("<div id=\"rrtable\"><table class=\"genTbl reportTbl\"><tbody>\n<tr class=\"alignBottom\"><th><span class=\"bold\">Period Ending:</span></th>")
+    for year in years:
+        html.append("<th>{}<div class=\"noBold arial_11\">31/12</div></th>".format(year))
+    html.append("</tr>\n")
+    # the period length is a header on some pages and a regular row on others
+    cell = "th" if length_header else "td"
+    html.append("<tr><{0}><span class=\"bold\">Period Length:</span></{0}>{1}</tr>\n".format(cell, "".join("<{0}>12 Months</{0}>".format(cell) for _ in years)))
+    for label in rows:
+        scale = random_generator.uniform(1, 5000)
+        html.append("<tr class=\"openTr pointer\"><td class=\"bold left\"><span class=\"ecoIcon\"></span>{}</td>{}</tr>\n".format(
+            label, "".join("<td>{}</td>".format(value(random_generator, scale)) for _ in years)))
+        if random_generator.random() < 0.2:
+            # expandable sub items, rendered as a nested table
+            html.append("<tr class=\"noHover\"><td colspan=\"{}\"><div class=\"arrowDown\"></div><table class=\"reportInnerTbl\"><tbody><tr><td>{} (detail)</td>{}</tr></tbody></table></td></tr>\n".format(
+                len(years) + 1, label, "".join("<td>{}</td>".format(value(random_generator, scale)) for _ in years)))
+    html.append("</tbody></table></div>\n")
+    html.append(tail(random_generator, filler_size))
+    return "".join(html)
+
+def ratios(equity, price, random_generator, filler_size):
+    html = [head(equity, price, random_generator, filler_size)]
+    html.append("<table class=\"genTbl reportTbl ratioTable\" id=\"rrTable\"><thead><tr><th>Name</th><th>Company</th><th>Industry</th></tr></thead><tbody>\n")
+    for label in ratios_rows:
+        html.append("<tr><td><span>{}</span></td><td>{}</td><td>{}</td></tr>\n".format(
+            label, value(random_generator, 30), value(random_generator, 30)))
+    html.append("</tbody></table>\n")
+    html.append(tail(random_generator, filler_size))
+    return "".join(html)
+
+def pages(equity, years=4, last_year=2021, filler_size=150000, price=None):
+    random_generator = random.Random(equity["ISIN"])
+    drawn_price = random_generator.uniform(1, 500)
+    price = drawn_price if price is None else price
+    period = list(reversed(range(last_year - years + 1, last_year + 1)))
+    return {
+        "income-statement": statement(equity, price, income_statement_rows, period, random_generator, filler_size),
+        "balance-sheet": statement(equity, price, balance_sheet_rows, period, random_generator, filler_size),
+        "cash-flow": statement(equity, price, cash_flow_rows, period, random_generator, filler_size, length_header=True),
+        "ratios": ratios(equity, price, random_generator, filler_size),
+        "quote": head(equity, price, random_generator, filler_size) + tail(random_generator, filler_size),
+    }
+
+def generate(path, equities, **kwargs):
+    for equity in equities:
+        for page, html in pages(equity, **kwargs).items():
+            file_path = fetchers.fixture_path(path, equity["ISIN"], page)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with gzip.open(file_path, "wt", encoding="utf-8") as f:
+                f.write(html)
+
+def universe(country="FR"):
+    return [equity for key, equity in index.load().keys.items() if key == equity["ISIN"] and equity["Country"] == country]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic investing.com pages that can be replayed with --replay")
+    parser.add_argument("path", help="Output folder")
+    parser.add_argument("-c", "--country", default="FR", help="Country file of the equities to generate")
+    parser.add_argument("-n", "--count", type=int, default=None, help="Only generate the first N equities")
+    parser.add_argument("-y", "--years", type=int, default=4, help="Number of fiscal years per statement")
+    args = parser.parse_args()
+
+    equities = universe(args.country)[:args.count]
+    generate(args.path, equities, years=args.years)
+    print("{} equities generated under {}".format(len(equities), args.path))
@@ -0,0 +1,93 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import numpy as np
+
+import config
+import fixtures
+from scrappers.investing import history
+
+rows = {
+    "income_statement": fixtures.income_statement_rows,
+    "balance_sheet": fixtures.balance_sheet_rows,
+    "cash_flow": fixtures.cash_flow_rows,
+}
+
+def tables(ISIN, years, last_year):
+    random_generator = random.Random(ISIN)
+    periods = ["31/12/{}".format(year) for year in range(last_year, last_year - years, -1)]
+    for name, labels in rows.items():
+        values = np.array([[random_generator.uniform(-1000, 5000) for _ in periods] for _ in labels])
+        yield name, (values, list(labels), periods)
+
+def segment_count():
+    return sum(len(history.segments(history.path("FR", year))) for year in history.segments(history.path("FR")))
+
+parser = argparse.ArgumentParser(description="Net Income of every company over the years from the history store, column-projected compared to reading everything")
+parser.add_argument("-n", "--count", type=int, default=200, help="Number of equities")
+parser.add_argument("-y", "--years", type=int, default=10, help="Fiscal years per statement")
+args = parser.parse_args()
+
+ISINs = [equity["ISIN"] for equity in fixtures.universe()[:args.count]]
+last_year = 2024
+first_year = last_year - args.years + 1
+
+with tempfile.TemporaryDirectory() as path:
+    config.cache_dir = path
+
+    # without the automatic compaction first, to time the reads of one segment per statement and year
+    automatic = config.history_segments
+    config.history_segments = float("inf")
+    start = time.perf_counter()
+    for ISIN in ISINs:
+        for name, table in tables(ISIN, args.years, last_year):
+            history.append(ISIN, "FR", name, table)
+    print("append: {:.2f}s, {} segments".format(time.perf_counter() - start, segment_count()))
+
+    # the same figures scraped again add nothing
+    start = time.perf_counter()
+    written = sum(history.append(ISIN, "FR", name, table) for ISIN in ISINs for name, table in tables(ISIN, args.years, last_year))
+    print("append again: {:.2f}s, {} segments written".format(time.perf_counter() - start, written))
+
+    start = time.perf_counter()
+    data = history.read("FR", "Net Income", (first_year, last_year), columns=("ISIN", "period", "value"))
+    print("read, one segment per statement and year: {:.3f}s, {} rows".format(time.perf_counter() - start, len(data)))
+
+    start = time.perf_counter()
+    merged = history.compact("FR")
+    print("compact: {:.2f}s, {} segments merged".format(time.perf_counter() - start, merged))
+    config.history_segments = automatic
+
+    start = time.perf_counter()
+    data = history.read("FR", "Net Income", (first_year, last_year), columns=("ISIN", "period", "value"))
+    elapsed = time.perf_counter() - start
+    print("read, compacted: {:.3f}s, {} rows".format(elapsed, len(data)))
+
+    # everything deserialized, then filtered
+    start = time.perf_counter()
+    everything = history.read("FR")
+    everything = everything[(everything["label"] == "Net Income") & (everything["period"].str[-4:].astype(int) >= first_year)]
+    full_elapsed = time.perf_counter() - start
+    print("read everything: {:.3f}s ({:.1f}x slower)".format(full_elapsed, full_elapsed / elapsed))
+    print("mismatches: {}".format(int(len(everything) != len(data) or not np.allclose(np.sort(everything["value"].to_numpy()), np.sort(data["value"].to_numpy())))))
+
+    # a new fiscal year scraped with the automatic compaction, as fundamentals.py and screen.py do
+    start = time.perf_counter()
+    for ISIN in ISINs:
+        for name, table in tables(ISIN, 1, last_year + 1):
+            history.append(ISIN, "FR", name, table)
+    print("append a new year, compacted as it grows: {:.2f}s, {} segments".format(
+        time.perf_counter() - start, len(history.segments(history.path("FR", last_year + 1)))))
+    start = time.perf_counter()
+    data = history.read("FR", "Net Income", (last_year + 1, last_year + 1), columns=("ISIN", "period", "value"))
+    print("read it: {:.3f}s, {} rows".format(time.perf_counter() - start, len(data)))
+
+    # an unknown country, a mistyped label or years not scraped yet read as an empty frame with the usual columns
+    empty = [history.read("DE", "Net Income"), history.read("FR", "Nett Income"), history.read("FR", "Net Income", (2030, 2031))]
+    print("empty reads: {}".format("ok" if all(not len(data) and not len(data["period"].str[-4:]) for data in empty) else "failed"))
@@ -0,0 +1,46 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import numpy as np
+
+import config
+import scrappers.investing as inv
+from scrappers.investing.fetchers import HttpFetcher, ReplayFetcher
+from server import serve
+
+statements = ["income_statement", "balance_sheet", "cash_flow", "ratios"]
+
+def same(a, b):
+    return list(a.index) == list(b.index) and list(a.columns) == list(b.columns) and np.allclose(a.values, b.values, equal_nan=True)
+
+parser = argparse.ArgumentParser(description="Fetch recorded pages from a local stand-in server with the http fetcher")
+parser.add_argument("path", help="Folder of pages saved with --record or generated by benchmarks/fixtures.py")
+parser.add_argument("-n", "--count", type=int, default=None, help="Only fetch the first N equities")
+args = parser.parse_args()
+
+# the served pages are fixtures, not figures to keep in the history
+config.history = False
+
+server = serve(args.path)
+replay = ReplayFetcher(args.path)
+http = HttpFetcher(server.origin)
+# the statements cache would hide the fetcher
+http.cacheable = False
+
+ISINs = replay.ISINs()[:args.count]
+mismatches = 0
+start = time.perf_counter()
+for ISIN in ISINs:
+    equity = inv.Equity(ISIN, fetcher=http).load()
+    expected = inv.Equity(ISIN, fetcher=replay)
+    mismatches += not all(same(getattr(equity, name).data, getattr(expected, name).data) for name in statements)
+    mismatches += equity.price != expected.price
+elapsed = time.perf_counter() - start
+
+print("equities: {}, mismatches: {}".format(len(ISINs), mismatches))
+print("requests: {}, connections opened: {}".format(server.requests, server.connections))
+print("total: {:.2f}s (fetch and parse, plus the replayed reference)".format(elapsed))
@@ -0,0 +1,42 @@
+import csv
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from scrappers.investing import index
+
+def scan(country, ISIN):
+    # what Equity used to do for every lookup
+    with open(os.path.join(index.equities_path, f"{country}.csv"), newline="") as f:
+        for equity in csv.DictReader(f):
+            if equity["ISIN"] == ISIN:
+                return equity["Url"]
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+sources = index.sources()
+_, build_time = timed(index.build, sources)
+index.save(index.build(sources))
+_, read_time = timed(index.read, sources)
+
+equities = {equity["ISIN"]: equity["Country"] for equity in index.load().keys.values()}
+
+start = time.perf_counter()
+for ISIN in equities:
+    index.find(ISIN)
+lookup_time = (time.perf_counter() - start) / len(equities)
+
+start = time.perf_counter()
+for ISIN, country in equities.items():
+    scan(country, ISIN)
+scan_time = (time.perf_counter() - start) / len(equities)
+
+print("build index from {} csv file(s): {:.2f}ms".format(len(sources), build_time * 1e3))
+print("load pickled index: {:.2f}ms".format(read_time * 1e3))
+print("lookup (index): {:.3f}us".format(lookup_time * 1e6))
+print("lookup (csv scan): {:.3f}us".format(scan_time * 1e6))
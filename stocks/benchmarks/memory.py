@@ -0,0 +1,13 @@
+import resource
+
+def peak_memory():
+    # high-water mark of the resident memory, in KB,
+    # ru_maxrss survives exec on linux, so a child would report the peak of its parent
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
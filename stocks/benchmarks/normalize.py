@@ -0,0 +1,72 @@
+import argparse
+import datetime
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from scrappers.investing import normalize
+
+def synthetic(n_rows, n_columns, random_generator):
+    labels = ["Period Length:"] + ["Row {}".format(i) for i in range(n_rows)]
+    headers = ["{}31/12".format(2021 - i) for i in range(n_columns)]
+    values = random_generator.uniform(-1000, 5000, (n_rows + 1, n_columns))
+    values[0] = np.nan
+    values[random_generator.random(values.shape) < 0.05] = np.nan
+    return labels, headers, values
+
+def read_html_like(labels, headers, values):
+    # what pd.read_html used to hand over: labels as first column, "-" for missing values
+    cells = np.where(np.isnan(values), "-", values.astype(str)).astype(object)
+    cells[0] = "12 Months"
+    table = pd.DataFrame(cells, columns=headers)
+    table.insert(0, "Period Ending:", labels)
+    return table
+
+def previous(table):
+    # the normalization that used to be repeated for each statement
+    for i in range(1, len(table.columns)):
+        column_name = table.columns[i]
+        if column_name.startswith("Unnamed"):
+            table = table.drop(columns=[column_name])
+        else:
+            table = table.rename(columns={column_name: datetime.datetime.strptime(column_name, "%Y%d/%m").strftime("%d/%m/%Y")})
+    table.index = table.iloc[:, 0]
+    table.index.name = ""
+    table = table.drop(columns=["Period Ending:"])
+    table = table.apply(pd.to_numeric, errors="coerce")
+    table = table.dropna(how="all")
+    table *= 1e6
+    return table
+
+def measure(function, *args):
+    number = 20
+    elapsed = min(timeit.repeat(lambda: function(*args), number=number, repeat=3)) / number
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+parser = argparse.ArgumentParser(description="Compare the statement normalizer with the previous per column loop")
+parser.add_argument("-r", "--rows", type=int, default=60, help="Number of rows per statement")
+args = parser.parse_args()
+
+random_generator = np.random.default_rng(0)
+for n_columns in (4, 10, 20, 40):
+    labels, headers, values = synthetic(args.rows, n_columns, random_generator)
+    table = read_html_like(labels, headers, values)
+    expected = previous(table)
+    result, result_labels, result_columns = normalize.statement(labels, headers, values)
+    assert list(expected.index) == result_labels and list(expected.columns) == result_columns
+    assert np.allclose(expected.values, result, equal_nan=True)
+
+    previous_time, previous_peak = measure(previous, table)
+    time, peak = measure(normalize.statement, labels, headers, values)
+    print("{:>2} columns: previous {:.2f}ms / {:.0f}KB, normalize {:.3f}ms / {:.0f}KB".format(
+        n_columns, previous_time * 1e3, previous_peak / 1024, time * 1e3, peak / 1024))
@@ -0,0 +1,211 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import numpy as np
+
+import reference
+import scrappers.investing as inv
+from pickers import buffet, mayer, slater
+from pickers.panel import Panel, fields
+from scrappers.investing.balance_sheet import BalanceSheet
+from scrappers.investing.cash_flow import CashFlow
+from scrappers.investing.fetchers import ReplayFetcher
+from scrappers.investing.income_statement import IncomeStatement
+from scrappers.investing.ratios import Ratios
+
+labels = {
+    "total_revenue": "Total Revenue",
+    "gross_profit": "Gross Profit",
+    "selling_general_administrative_expenses": "Selling/General/Admin. Expenses, Total",
+    "interest_expense": "Interest Expense (Income) - Net Operating",
+    "interest_income": "Interest Income (Expense), Net Non-Operating",
+    "net_income_after_taxes": "Net Income After Taxes",
+    "income_available_to_common_excluding_extraordinary_items": "Income Available to Common Excluding Extraordinary Items",
+    "provision_for_income_taxes": "Provision for Income Taxes",
+    "depreciation_amortization": "Depreciation / Amortization",
+    "operating_income": "Operating Income",
+    "net_income": "Net Income",
+    "net_income_before_taxes": "Net Income Before Taxes",
+    "total_current_assets": "Total Current Assets",
+    "total_current_liabilities": "Total Current Liabilities",
+    "total_assets": "Total Assets",
+    "cash_and_equivalents": "Cash & Equivalents",
+    "short_term_investments": "Short Term Investments",
+    "accounts_receivable": "Accounts Receivables - Trade, Net",
+    "total_inventory": "Total Inventory",
+    "total_property_plant_equipment": "Property/Plant/Equipment, Total - Net",
+    "short_term_debt": "Notes Payable/Short Term Debt",
+    "total_long_term_debt": "Total Long Term Debt",
+    "total_equity": "Total Equity",
+    "total_common_shares_outstanding": "Total Common Shares Outstanding",
+    "capital_expenditures": "Capital Expenditures",
+    "depreciation": "Depreciation/Depletion",
+    "price_to_sales_ttm": "Price to Sales TTM",
+}
+
+statement_types = {"income_statement": IncomeStatement, "balance_sheet": BalanceSheet, "cash_flow": CashFlow, "ratios": Ratios}
+
+# the original scalar pickers couldn't cope without these
+required = {"net_income", "shares", "revenue"}
+
+class SyntheticEquity:
+
+    def __init__(self, ISIN, statements, price):
+        self.ISIN = ISIN
+        self.name = ISIN
+        self.price = price
+        for name, statement in statements.items():
+            setattr(self, name, statement)
+
+    def market_cap(self):
+        return self.balance_sheet.total_common_shares_outstanding()[0] * self.price
+
+def synthetic_equity(i, random_generator):
+    rows = {name: {} for name in statement_types}
+    years = {name: int(random_generator.integers(1, 7)) for name in statement_types}
+    years["ratios"] = 2
+    # the inventory trend is only evaluated when both statements cover the same years
+    if random_generator.random() < 0.5:
+        years["balance_sheet"] = years["income_statement"]
+    for field, (statement, accessor) in fields.items():
+        if field not in required and random_generator.random() < 0.1:
+            continue
+        draw = random_generator.random(years[statement])
+        values = random_generator.lognormal(18, 2, years[statement]) * np.where(draw < 0.15, -1, 1)
+        values[draw > 0.95] = np.nan
+        values[(draw > 0.9) & (draw <= 0.95)] = 0
+        if field == "shares":
+            values = np.abs(values) / random_generator.uniform(1, 100)
+        if field == "price_to_sales":
+            values = random_generator.uniform(0, 5, years[statement])
+        rows[statement][labels[accessor]] = values
+
+    statements = {}
+    for name, statement_type in statement_types.items():
+        columns = ["Company", "Industry"] if name == "ratios" else ["31/12/{}".format(2021 - year) for year in range(years[name])]
+        row_labels = list(rows[name])
+        values = np.array([rows[name][label] for label in row_labels]).reshape(len(row_labels), len(columns))
+        statements[name] = statement_type((values, row_labels, columns))
+    return SyntheticEquity("XX{:010d}".format(i), statements, random_generator.uniform(1, 200))
+
+def earnings_equity(ISIN, net_income):
+    # a smallcap with nothing but its net income, most recent year first
+    columns = ["31/12/{}".format(2021 - year) for year in range(len(net_income))]
+    statements = {
+        "income_statement": IncomeStatement((np.array([net_income], dtype=np.float64), [labels["net_income"]], columns)),
+        "balance_sheet": BalanceSheet((np.full((1, len(columns)), 1e6), [labels["total_common_shares_outstanding"]], columns)),
+        "cash_flow": CashFlow((np.empty((0, len(columns))), [], columns)),
+        "ratios": Ratios((np.empty((0, 2)), [], ["Company", "Industry"])),
+    }
+    return SyntheticEquity(ISIN, statements, 1000)
+
+# net income series, most recent year first, with a loss or nothing at one end: they have no growth rate
+losses = {
+    "a loss in the latest year": [-50, 100, 120, 150],
+    "losses every year": [-100, -50, -20],
+    "nothing in the latest year": [0, 50, 100],
+    "nothing in the oldest year": [100, 50, 0],
+    "a loss in the oldest year": [150, 50, -20],
+}
+
+def check_losses():
+    # they must fail Slater's growth rule, not escape it and score higher than a slow growth
+    equities = [earnings_equity("SLOW", [105, 102, 100])] + [earnings_equity(name, series) for name, series in losses.items()]
+    evaluation = slater.profile.evaluate_equities(equities)
+    evaluated, approved, _, _ = evaluation.results["earnings_growth"]
+    for i, case in enumerate(losses, 1):
+        ok = evaluated[i] and not approved[i] and evaluation[i] <= evaluation[0]
+        print("Slater earnings with {}: score {:.2f}, slow growth {:.2f}, {}".format(case, evaluation[i], evaluation[0], "failed" if ok else "MISMATCH"))
+    # a single year has no trend, Buffet fails it like no growth
+    evaluation = buffet.profile.evaluate_equities([earnings_equity("ONE", [100])])
+    evaluated, approved, _, _ = evaluation.results["earnings_trend"]
+    print("Buffet earnings over a single year: {}".format("failed" if evaluated[0] and not approved[0] else "MISMATCH"))
+
+def synthetic_panel(n, years, random_generator):
+    values = {}
+    masks = {}
+    lengths = {}
+    for field in fields:
+        values[field] = random_generator.lognormal(18, 2, (n, years)) * np.where(random_generator.random((n, years)) < 0.15, -1, 1)
+        masks[field] = random_generator.random(n) > 0.1
+        lengths[field] = random_generator.integers(1, years + 1, n)
+    price = random_generator.uniform(1, 200, n)
+    return Panel(["XX{:010d}".format(i) for i in range(n)], [""] * n, price, values, masks, lengths)
+
+def same(expected, actual):
+    expected = np.array([np.nan if score is None else score for score in expected])
+    return np.array_equal(expected, actual, equal_nan=True)
+
+def differences(profile, evaluation, verdicts):
+    # rule name -> number of equities the rule engine and the scalar reference evaluate or approve differently
+    counts = {}
+    for rule in profile.rules:
+        evaluated, approved, _, _ = evaluation.results[rule.name]
+        counts[rule.name] = sum(
+            (rule.name in expected) != bool(evaluated[i]) or rule.name in expected and expected[rule.name] != bool(approved[i])
+            for i, expected in enumerate(verdicts))
+    return counts
+
+def score_changes(before, after):
+    # how the scores moved from the hand-written pickers to the rules
+    before = np.array([np.nan if score is None else score for score in before])
+    scored = ~np.isnan(before) & ~np.isnan(after)
+    difference = after[scored] - before[scored]
+    changed = difference != 0
+    return "score before/after: {} of {} changed, {} up, {} down, mean {:+.2f}, mean absolute {:.2f}, max absolute {:.2f}, {} no longer scored, {} newly scored".format(
+        changed.sum(), scored.sum(), (difference > 0).sum(), (difference < 0).sum(),
+        difference.mean() if scored.any() else 0, np.abs(difference).mean() if scored.any() else 0, np.abs(difference).max(initial=0),
+        (~np.isnan(before) & np.isnan(after)).sum(), (np.isnan(before) & ~np.isnan(after)).sum())
+
+def check(label, equities):
+    panel = Panel.from_equities(equities)
+    for name, picker, profile, scalar in pickers:
+        start = time.perf_counter()
+        expected = [picker(equity).evaluation(verbose=False) for equity in equities]
+        one_by_one_time = time.perf_counter() - start
+        start = time.perf_counter()
+        evaluation = profile.evaluate(panel)
+        batch_time = time.perf_counter() - start
+        print("{:<6} {} {} equities: one by one {:.1f}ms, batch {:.2f}ms, {}".format(
+            name, len(equities), label, one_by_one_time * 1e3, batch_time * 1e3, "identical" if same(expected, evaluation.score) else "MISMATCH"))
+
+        with np.errstate(all="ignore"):
+            verdicts = [scalar(equity) for equity in equities]
+        counts = differences(profile, evaluation, verdicts)
+        unexpected = ["{} on {} equities".format(rule, count) for rule, count in counts.items() if count and rule not in reference.changed[name]]
+        print("       against the scalar pickers: {}".format("MISMATCH " + ", ".join(unexpected) if unexpected else "identical"))
+        for rule in profile.rules:
+            if rule.name in reference.changed[name]:
+                print("       {} changed on purpose, differs on {} equities".format(rule.name, counts[rule.name]))
+        if reference.changed[name]:
+            print("       " + score_changes([reference.score(expected) for expected in verdicts], evaluation.score))
+
+parser = argparse.ArgumentParser(description="Check the pickers against the hand-written ones they replaced, score a panel like each equity on its own and time them")
+parser.add_argument("-c", "--check", type=int, default=2000, help="Number of synthetic equities scored both ways")
+parser.add_argument("-n", "--count", type=int, default=10000, help="Number of companies in the timed panel")
+parser.add_argument("-y", "--years", type=int, default=5, help="Number of years in the timed panel")
+parser.add_argument("--pages", metavar="DIR", help="Also check the equities of pages saved with --record or generated by benchmarks/fixtures.py")
+args = parser.parse_args()
+
+pickers = [
+    ("Buffet", buffet.Buffet, buffet.profile, reference.buffet),
+    ("Mayer", mayer.Mayer, mayer.profile, reference.mayer),
+    ("Slater", slater.Slater, slater.profile, reference.slater),
+]
+
+check_losses()
+random_generator = np.random.default_rng(0)
+check("synthetic", [synthetic_equity(i, random_generator) for i in range(args.check)])
+if args.pages:
+    fetcher = ReplayFetcher(args.pages)
+    check("replayed", [inv.Equity(ISIN, fetcher=fetcher).load() for ISIN in fetcher.ISINs()])
+
+panel = synthetic_panel(args.count, args.years, random_generator)
+for name, picker, profile, scalar in pickers:
+    start = time.perf_counter()
+    profile.evaluate(panel)
+    print("{:<6} {} companies x {} years: {:.2f}ms".format(name, args.count, args.years, (time.perf_counter() - start) * 1e3))
@@ -0,0 +1,134 @@
+import numpy as np
+
+# the arithmetic of the hand-written pickers the rules replaced, one equity at a time,
+# kept as the reference the rule engine is checked against:
+# each function returns rule name -> approved for the rules the picker evaluated
+
+# rules whose semantics were changed on purpose when the trends moved to the growth kernels
+changed = {
+    "Buffet": {"earnings_trend", "inventory_trend", "cash_trend"},
+    "Mayer": set(),
+    "Slater": {"earnings_growth"},
+}
+
+def latest(value):
+    return None if value is None else value[0]
+
+def earnings_growth(annual_net_income):
+    earnings_growth = 0
+    n = len(annual_net_income)
+    for i in reversed(range(1, n-1)):
+        sign = +1
+        if annual_net_income[i-1] > annual_net_income[i]:
+            sign = -1
+        earnings_growth += sign * (1 - (annual_net_income[i-1] / annual_net_income[i])) * 100
+    return earnings_growth / n
+
+def buffet(equity):
+    verdicts = {}
+
+    income_statement = equity.income_statement
+    annual_net_income = income_statement.net_income()
+    gross_profit = latest(income_statement.gross_profit())
+    interest_expense = latest(income_statement.interest_expense())
+    net_income = latest(annual_net_income)
+    operating_income = latest(income_statement.operating_income())
+    revenue = latest(income_statement.total_revenue())
+    sga = latest(income_statement.selling_general_administrative_expenses())
+
+    if gross_profit and revenue:
+        verdicts["gross_margin"] = gross_profit / revenue * 100 > 40
+    if net_income and revenue:
+        verdicts["net_margin"] = net_income / revenue * 100 > 20
+    if sga and gross_profit:
+        verdicts["sga_to_gross_margin"] = sga * 100 / gross_profit < 30
+    if interest_expense and operating_income:
+        verdicts["interest_expense"] = interest_expense * 100 / operating_income < 15
+    verdicts["earnings_trend"] = earnings_growth(annual_net_income) > 0
+
+    balance_sheet = equity.balance_sheet
+    current_assets = latest(balance_sheet.total_current_assets())
+    current_liabilities = latest(balance_sheet.total_current_liabilities())
+    long_term_debt = latest(balance_sheet.total_long_term_debt())
+    property_plant_equipment = latest(balance_sheet.total_property_plant_equipment())
+    annual_inventory = balance_sheet.total_inventory()
+    annual_cash_and_equivalents = balance_sheet.cash_and_equivalents()
+
+    if current_assets and current_liabilities:
+        verdicts["current_ratio"] = current_assets / current_liabilities > 1.5
+    if annual_inventory is not None:
+        n = len(annual_inventory)
+        if n > 0 and n == len(annual_net_income):
+            inline_with_each_other = True
+            for i in range(n-1):
+                earnings_growth_ = (1 - (annual_net_income[n-1-i] / annual_net_income[n-1-i-1])) * 100
+                inventory_growth = (1 - (annual_inventory[i] / (annual_inventory[i+1] + np.finfo(float).eps))) * 100
+                if np.sign(earnings_growth_) != np.sign(inventory_growth):
+                    inline_with_each_other = False
+                    break
+            verdicts["inventory_trend"] = inline_with_each_other
+    if property_plant_equipment and net_income:
+        verdicts["ppe"] = property_plant_equipment / net_income < 2
+
+    cash_flow = equity.cash_flow
+    capital_expenditures = latest(cash_flow.capital_expenditures())
+    depreciation = latest(cash_flow.depreciation())
+
+    if depreciation and gross_profit:
+        verdicts["depreciation"] = depreciation * 100 / gross_profit < 15
+    if annual_cash_and_equivalents is not None:
+        cash_growth = 0
+        n = len(annual_cash_and_equivalents)
+        for i in range(n-1):
+            cash_growth += (1 - (annual_cash_and_equivalents[i] / annual_cash_and_equivalents[i+1])) * 100
+            cash_growth /= n
+        verdicts["cash_trend"] = cash_growth > 0
+    if long_term_debt and net_income:
+        verdicts["long_term_debt"] = long_term_debt / net_income < 4
+    if capital_expenditures and net_income:
+        verdicts["capex"] = np.abs(capital_expenditures) * 100 / net_income < 50
+    return verdicts
+
+def mayer(equity):
+    verdicts = {}
+    revenue = latest(equity.income_statement.total_revenue())
+    price_to_sales_ratio = latest(equity.ratios.price_to_sales_ttm())
+    # missing ratios are NaN
+    if price_to_sales_ratio is not None and price_to_sales_ratio != price_to_sales_ratio:
+        price_to_sales_ratio = None
+    market_cap = equity.market_cap()
+
+    if market_cap and price_to_sales_ratio:
+        verdicts["hundred_bagger"] = bool((market_cap > 300e6 and market_cap < 700e6) and revenue is not None and (revenue > 140e6 and revenue < 200e6)
+            and (price_to_sales_ratio > 2.5 and price_to_sales_ratio < 3.5))
+    return verdicts
+
+def slater(equity):
+    verdicts = {}
+    market_cap = equity.market_cap()
+    if market_cap:
+        verdicts["smallcap"] = market_cap > 300e6 and market_cap < 2e9
+
+    income_statement = equity.income_statement
+    ebit = latest(income_statement.net_income_before_taxes())
+    verdicts["earnings_growth"] = earnings_growth(income_statement.net_income()) > 15
+
+    balance_sheet = equity.balance_sheet
+    accounts_receivable = latest(balance_sheet.accounts_receivable())
+    cash_and_cash_equivalents = latest(balance_sheet.cash_and_equivalents())
+    current_liabilities = latest(balance_sheet.total_current_liabilities())
+    other_short_term_investments = latest(balance_sheet.short_term_investments())
+    total_assets = latest(balance_sheet.total_assets())
+
+    if total_assets and current_liabilities and ebit:
+        capital_employed = total_assets - current_liabilities
+        verdicts["roce"] = ebit / capital_employed * 100 > 20
+    if other_short_term_investments and accounts_receivable and cash_and_cash_equivalents and current_liabilities:
+        verdicts["quick_ratio"] = (cash_and_cash_equivalents + other_short_term_investments + accounts_receivable) / current_liabilities > 1
+    return verdicts
+
+def score(verdicts):
+    # None when nothing could be evaluated, like the pickers
+    if not verdicts:
+        return None
+    return sum(verdicts.values()) * 10 / len(verdicts)
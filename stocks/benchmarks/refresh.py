@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import config
+import fixtures
+from refresh import refresh, statuses
+from server import serve
+
+def run(server, ISINs, full=False):
+    requests = server.requests
+    counts = Counter()
+    scores = {}
+    start = time.perf_counter()
+    for ISIN in ISINs:
+        analysis, status = refresh(ISIN, full)[:2]
+        counts[statuses[status]] += 1
+        scores[ISIN] = {name: result.score for name, result in analysis.pickers.items()}
+    return time.perf_counter() - start, server.requests - requests, counts, scores
+
+parser = argparse.ArgumentParser(description="Nightly refresh of synthetic equities served by a local stand-in server, full compared to incremental")
+parser.add_argument("-n", "--count", type=int, default=50, help="Number of equities")
+parser.add_argument("--new-year", type=float, default=0.05, help="Share of the equities publishing a new fiscal year")
+parser.add_argument("--new-price", type=float, default=0.5, help="Share of the equities with a new price")
+args = parser.parse_args()
+
+equities = fixtures.universe()[:args.count]
+ISINs = [equity["ISIN"] for equity in equities]
+new_year = equities[:max(1, int(len(equities) * args.new_year))]
+new_price = equities[len(new_year):len(new_year) + int(len(equities) * args.new_price)]
+
+with tempfile.TemporaryDirectory() as path:
+    pages = os.path.join(path, "pages")
+    config.cache_dir = os.path.join(path, "cache")
+    fixtures.generate(pages, equities)
+    server = serve(pages)
+    config.fetcher = "http"
+    config.origin = server.origin
+
+    # first night: nothing is cached yet
+    elapsed, requests, counts, _ = run(server, ISINs)
+    print("initial: {:.2f}s, {} requests, {}".format(elapsed, requests, dict(counts)))
+
+    # a few companies published their annual report, many prices moved
+    fixtures.generate(pages, new_year, last_year=2022)
+    fixtures.generate(pages, new_price, price=1.0)
+
+    elapsed, requests, counts, scores = run(server, ISINs)
+    print("incremental: {:.2f}s, {} requests, {}".format(elapsed, requests, dict(counts)))
+    full_elapsed, full_requests, _, full_scores = run(server, ISINs, full=True)
+    print("full: {:.2f}s, {} requests".format(full_elapsed, full_requests))
+    mismatches = sum(scores[ISIN] != full_scores[ISIN] for ISIN in ISINs)
+    print("speedup: {:.1f}x, {:.1f}x fewer requests, score mismatches: {}".format(
+        full_elapsed / elapsed, full_requests / max(1, requests), mismatches))
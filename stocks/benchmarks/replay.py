@@ -0,0 +1,39 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import scrappers.investing as inv
+from scrappers.investing.fetchers import ReplayFetcher
+
+parser = argparse.ArgumentParser(description="Parse recorded pages through Equity and report the throughput")
+parser.add_argument("path", help="Folder of pages saved with --record or generated by benchmarks/fixtures.py")
+parser.add_argument("-n", "--count", type=int, default=None, help="Only parse the first N equities")
+args = parser.parse_args()
+
+fetcher = ReplayFetcher(args.path)
+ISINs = fetcher.ISINs()[:args.count]
+if not ISINs:
+    sys.exit("No recorded pages under {}".format(args.path))
+
+timings = []
+failures = 0
+start = time.perf_counter()
+for ISIN in ISINs:
+    equity_start = time.perf_counter()
+    try:
+        inv.Equity(ISIN, fetcher=fetcher).load()
+    except Exception as e:
+        failures += 1
+        print("{}: {}".format(ISIN, e), file=sys.stderr)
+        continue
+    timings.append(time.perf_counter() - equity_start)
+elapsed = time.perf_counter() - start
+
+print("equities: {} ({} failed)".format(len(ISINs), failures))
+print("total: {:.2f}s, {:.1f} equities/s".format(elapsed, len(ISINs) / elapsed))
+if timings:
+    print("per equity: median {:.1f}ms, max {:.1f}ms".format(statistics.median(timings) * 1e3, max(timings) * 1e3))
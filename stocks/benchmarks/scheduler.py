@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import config
+import scrappers.investing as inv
+from scrappers.investing import aio
+from scrappers.investing import scheduler
+from scrappers.investing.fetchers import HttpFetcher, ReplayFetcher
+from scrappers.investing.scheduler import Scheduler
+from server import serve
+
+def fetcher(origin, priority="interactive"):
+    http = HttpFetcher(origin, priority=priority)
+    # the statements cache would hide the fetcher
+    http.cacheable = False
+    return http
+
+def use(instance):
+    # every fetcher of the process goes through the default scheduler
+    scheduler._default = instance
+    return instance
+
+async def load_all(ISINs, origin, concurrency, priority="interactive"):
+    failures = 0
+    async for ISIN, equity, error in aio.load_equities(ISINs, concurrency=concurrency, fetcher=fetcher(origin, priority)):
+        failures += error is not None
+    return failures
+
+parser = argparse.ArgumentParser(description="Bulk loading against a local stand-in server that throttles, and single company lookups during a bulk load")
+parser.add_argument("path", help="Folder of pages saved with --record or generated by benchmarks/fixtures.py")
+parser.add_argument("-n", "--count", type=int, default=20, help="Number of equities to load")
+parser.add_argument("-c", "--concurrency", type=int, default=16, help="Maximum number of pages fetched at once")
+parser.add_argument("--rate", type=float, default=40, help="Requests per second accepted by the server")
+parser.add_argument("--ban", type=int, default=50, help="429 after which the server returns 403 to everything")
+parser.add_argument("--errors", type=float, default=0.02, help="Share of requests failing with 503")
+args = parser.parse_args()
+
+# the served pages are fixtures, not figures to keep in the history
+config.history = False
+
+ISINs = ReplayFetcher(args.path).ISINs()[:args.count]
+
+print("server: {:.0f} requests/s, banned after {} 429, {:.0%} of 503".format(args.rate, args.ban, args.errors))
+runs = [
+    ("no retry", lambda host: Scheduler(concurrency=args.concurrency, retries=0)),
+    ("retries", lambda host: Scheduler(concurrency=args.concurrency, retries=6, backoff=0.1)),
+    ("retries and rate limit", lambda host: Scheduler({host: (args.rate * 0.9, 5)}, concurrency=args.concurrency, retries=6, backoff=0.1)),
+]
+for name, create in runs:
+    server = serve(args.path, delay=0.02, rate=args.rate, burst=5, ban=args.ban, errors=args.errors)
+    instance = use(create(urlsplit(server.origin).netloc))
+    start = time.perf_counter()
+    failures = asyncio.run(load_all(ISINs, server.origin, args.concurrency))
+    elapsed = time.perf_counter() - start
+    print("{}: {:.2f}s, {} equities failed, {} requests, {} throttled, {} retries, banned: {}".format(
+        name, elapsed, failures, server.requests, server.throttled, instance.stats["retries"], server.throttled >= args.ban))
+    server.shutdown()
+
+# a single company looked up while a bulk load keeps the host busy
+server = serve(args.path, delay=0.1)
+for priority in ("bulk", "interactive"):
+    use(Scheduler(concurrency=2))
+    bulk = threading.Thread(target=lambda: asyncio.run(load_all(ISINs, server.origin, args.concurrency, "bulk")))
+    bulk.start()
+    time.sleep(0.5)
+    start = time.perf_counter()
+    inv.Equity(ISINs[0], fetcher(server.origin, priority)).load()
+    print("lookup during a bulk load, {} priority: {:.2f}s".format(priority, time.perf_counter() - start))
+    bulk.join()
@@ -0,0 +1,156 @@
+import argparse
+import gzip
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import lxml.html
+
+from scrappers.investing import fetchers
+from scrappers.investing import index
+from scrappers.investing.scheduler import TokenBucket
+
+# local stand-in for investing.com serving recorded pages
+
+pages = ["income-statement", "balance-sheet", "cash-flow", "ratios"]
+report_pages = {report_type: page for page, report_type in fetchers.report_types.items()}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+        if "gzip" in self.headers.get("Accept-Encoding", "") and body:
+            body = gzip.compress(body, compresslevel=1)
+            encoding = "gzip"
+        else:
+            encoding = None
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for name, value in ({} if headers is None else headers).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+        # simulated network latency
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        # simulated throttling: 429 above the rate limit, banned after too many of them, random server errors
+        status = self.server.throttle()
+        if status is not None:
+            return self.send(status, headers={"Retry-After": "1"} if status == 429 else None)
+        parts = urlsplit(self.path)
+        if parts.path == "/instruments/Financials/changereporttypeajax":
+            query = parse_qs(parts.query)
+            ISIN = self.server.pids.get(query.get("pair_ID", [""])[0])
+            page = report_pages.get(query.get("report_type", [""])[0])
+            html = self.server.page(ISIN, page)
+            if html is None:
+                return self.send(404)
+            # only the table is sent back, as investing.com does
+            table = lxml.html.document_fromstring(html).xpath("//div[@id='rrtable']/*")
+            return self.send(200, b"".join(lxml.html.tostring(element) for element in table))
+
+        # images of the pages, the lean browser doesn't download them
+        if parts.path.startswith("/img/"):
+            return self.send(200, self.server.image, "image/png")
+
+        ISIN, page = self.server.route(parts.path)
+        html = self.server.page(ISIN, page)
+        if html is None:
+            return self.send(404)
+        self.send(200, html.encode("utf-8"))
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, path, port=0, delay=0, rate=None, burst=1, ban=None, errors=0):
+        super().__init__(("127.0.0.1", port), Handler)
+        self.delay = delay
+        self.bucket = None if rate is None else TokenBucket(rate, burst)
+        self.ban = ban
+        self.errors = errors
+        self.random_generator = random.Random(0)
+        self.image = bytes(self.random_generator.randrange(256) for _ in range(20000))
+        self.throttled = 0
+        self.failed = 0
+        self.fetcher = fetchers.ReplayFetcher(path)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.paths = {}
+        self.pids = {}
+        for equity in index.load().keys.values():
+            self.paths[urlsplit(equity["Url"]).path] = equity["ISIN"]
+            self.pids[equity["PID"]] = equity["ISIN"]
+
+    def throttle(self):
+        with self.lock:
+            if self.ban is not None and self.throttled >= self.ban:
+                return 403
+            if self.bucket is not None and not self.bucket.take():
+                self.throttled += 1
+                return 429
+            if self.random_generator.random() < self.errors:
+                self.failed += 1
+                return 503
+        return None
+
+    @property
+    def origin(self):
+        return "http://{}:{}".format(*self.server_address)
+
+    def route(self, path):
+        if path in self.paths:
+            return self.paths[path], "quote"
+        for page in pages:
+            if path.endswith("-" + page):
+                return self.paths.get(path[:-len(page) - 1]), page
+        return None, None
+
+    def page(self, ISIN, page):
+        if ISIN is None or page is None:
+            return None
+        try:
+            return self.fetcher.fetch(ISIN, page, None)
+        except Exception:
+            return None
+
+def serve(path, port=0, delay=0, **throttling):
+    server = Server(path, port, delay, **throttling)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded pages as a local stand-in for investing.com")
+    parser.add_argument("path", help="Folder of pages saved with --record or generated by benchmarks/fixtures.py")
+    parser.add_argument("-p", "--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("-d", "--delay", type=float, default=0, help="Latency added to each response, in seconds")
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second above which 429 is returned")
+    parser.add_argument("--burst", type=int, default=1, help="Requests allowed at once above the rate")
+    parser.add_argument("--ban", type=int, default=None, help="Return 403 to everything after this many 429")
+    parser.add_argument("--errors", type=float, default=0, help="Share of requests failing with 503")
+    args = parser.parse_args()
+
+    server = Server(args.path, args.port, args.delay, args.rate, args.burst, args.ban, args.errors)
+    print("Serving {} on {}".format(args.path, server.origin))
+    server.serve_forever()
@@ -0,0 +1,43 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+cases = {
+    "no arguments": ["fundamentals.py"],
+    "help": ["fundamentals.py", "--help"],
+    "unsupported country": ["fundamentals.py", "XX0000000000"],
+    "ISIN not found": ["fundamentals.py", "FR0000000000"],
+}
+
+# importing the scrapper must not pull in pandas, bs4 or selenium
+import_check = "import sys, scrappers.investing; print(','.join(m for m in ('pandas', 'bs4', 'selenium') if m in sys.modules))"
+
+def run(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+parser = argparse.ArgumentParser(description="Measure the startup time of fundamentals.py on early exits")
+parser.add_argument("-n", "--repeat", type=int, default=5, help="Number of runs per case")
+parser.add_argument("-t", "--threshold", type=float, default=1.0, help="Maximum median time in seconds")
+args = parser.parse_args()
+
+failed = False
+for name, case in cases.items():
+    timings = [run(case) for _ in range(args.repeat)]
+    median = statistics.median(timings)
+    status = "ok" if median < args.threshold else "too slow"
+    failed |= median >= args.threshold
+    print("{:<20} median {:.3f}s  min {:.3f}s  max {:.3f}s  {}".format(name, median, min(timings), max(timings), status))
+
+loaded = subprocess.run([sys.executable, "-c", import_check], cwd=root, capture_output=True, text=True).stdout.strip()
+if loaded:
+    failed = True
+    print("heavy modules imported eagerly: {}".format(loaded))
+
+sys.exit(1 if failed else 0)
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import fixtures
+import report
+import scrappers.investing as inv
+from memory import peak_memory
+from pickers import buffet, mayer, slater
+from screen import pickers
+from scrappers.investing import extract
+from scrappers.investing import normalize
+from scrappers.investing.fetchers import ReplayFetcher
+from utils import stats
+from utils.translate import translator
+
+# every stage of an analysis timed on its own, offline, from recorded or synthetic pages
+
+statement_pages = ["income-statement", "balance-sheet", "cash-flow", "ratios"]
+
+def equities(path, ISINs):
+    fetcher = ReplayFetcher(path)
+    return [inv.Equity(ISIN, fetcher=fetcher).load() for ISIN in ISINs]
+
+## cases: setup(path, ISINs) returns the items, run(item) is timed for each of them
+
+def extract_setup(path, ISINs):
+    fetcher = ReplayFetcher(path)
+    return [(page, fetcher.fetch(ISIN, page, None)) for ISIN in ISINs for page in statement_pages]
+
+def extract_run(item):
+    page, html = item
+    document = extract.document(html)
+    return extract.ratios(document) if page == "ratios" else extract.statement(document)
+
+def normalize_setup(path, ISINs):
+    return [(page, extract_run((page, html))) for page, html in extract_setup(path, ISINs)]
+
+def normalize_run(item):
+    page, table = item
+    return normalize.ratios(*table) if page == "ratios" else normalize.statement(*table)
+
+def equity_setup(path, ISINs):
+    fetcher = ReplayFetcher(path)
+    return [(ISIN, fetcher) for ISIN in ISINs]
+
+def equity_run(item):
+    ISIN, fetcher = item
+    return inv.Equity(ISIN, fetcher=fetcher).load()
+
+def picker_run(name):
+    def run(equity):
+        picker = {"Buffet": buffet.Buffet, "Mayer": mayer.Mayer, "Slater": slater.Slater}[name]
+        return picker(equity).evaluation(verbose=False)
+    return run
+
+def report_run(equity):
+    # what fundamentals.py prints
+    return report.text(report.analyse(equity), translator("en"))
+
+def batch_run(item):
+    # what screen.py does for each equity, minus the worker processes
+    return report.analyse(equity_run(item), pickers, with_fundamentals=False)
+
+cases = {
+    "extract": ("page", extract_setup, extract_run),
+    "normalize": ("page", normalize_setup, normalize_run),
+    "equity": ("equity", equity_setup, equity_run),
+    "buffet": ("equity", equities, picker_run("Buffet")),
+    "mayer": ("equity", equities, picker_run("Mayer")),
+    "slater": ("equity", equities, picker_run("Slater")),
+    "report": ("equity", equities, report_run),
+    "batch": ("equity", equity_setup, batch_run),
+}
+
+def measure(name, path, ISINs, repeat):
+    unit, setup, run = cases[name]
+    items = setup(path, ISINs)
+    # the peak above what the setup needed is what the case itself needs
+    setup_peak = peak_memory()
+    # a warmup pass fills the caches and imports, then each item keeps its best time over the repeats
+    for item in items:
+        run(item)
+    timings = [None] * len(items)
+    totals = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i, item in enumerate(items):
+            item_start = time.perf_counter()
+            run(item)
+            elapsed = time.perf_counter() - item_start
+            timings[i] = elapsed if timings[i] is None else min(timings[i], elapsed)
+        totals.append(time.perf_counter() - start)
+    process_peak = peak_memory()
+    # allocations of the case alone, without the imports and the setup, traced in a second pass not to slow the timed one
+    tracemalloc.start()
+    for item in items:
+        run(item)
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return dict(stats.summary(timings), unit=unit, total=min(totals), peak_memory=process_peak, memory=process_peak - setup_peak, allocated=allocated)
+
+def compare(results, baseline, threshold, floor):
+    # ratio of the median time and of the memory allocated by the case to the baseline, a case is flagged above 1 + threshold,
+    # and for the time only when the whole case got slower by at least floor seconds, smaller differences are noise
+    regressions = []
+    rows = []
+    for name, result in results["cases"].items():
+        reference = baseline["cases"].get(name)
+        if reference is None:
+            continue
+        time_ratio = result["p50"] / reference["p50"] if reference["p50"] else None
+        memory_ratio = result["allocated"] / reference["allocated"] if reference.get("allocated") else None
+        slower = time_ratio is not None and time_ratio > 1 + threshold and result["total"] - reference["total"] >= floor
+        flagged = slower or memory_ratio is not None and memory_ratio > 1 + threshold
+        if flagged:
+            regressions.append(name)
+        rows.append([name, time_ratio, memory_ratio, "REGRESSION" if flagged else ""])
+    return rows, regressions
+
+parser = argparse.ArgumentParser(description="Time extraction, normalization, equity construction, the pickers, the report and a batch of equities, offline")
+parser.add_argument("--pages", metavar="DIR", help="Pages saved with --record or generated by benchmarks/fixtures.py, synthetic pages are generated otherwise")
+parser.add_argument("-n", "--count", type=int, default=50, help="Number of equities of each case but the batch")
+parser.add_argument("-b", "--batch", type=int, default=773, help="Number of equities of the batch")
+parser.add_argument("-c", "--cases", nargs="+", choices=list(cases), default=list(cases), help="Only run these cases")
+parser.add_argument("-o", "--output", metavar="FILE", help="Write the results as JSON")
+parser.add_argument("--baseline", metavar="FILE", help="Results of a previous run to compare with, exits with 1 on regressions")
+parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown or memory growth flagged as a regression, 0.2 is 20%%")
+parser.add_argument("--floor", type=float, default=0.001, help="Smallest slowdown of a whole case flagged as a regression, in seconds")
+parser.add_argument("-r", "--repeat", type=int, default=5, help="Timed passes after the warmup, each item keeps its best time")
+parser.add_argument("--case", help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+if args.case:
+    # child process: one case in isolation so that peak memory is its own
+    ISINs = json.loads(sys.stdin.read())
+    print(json.dumps(measure(args.case, args.pages, ISINs, args.repeat)))
+    sys.exit(0)
+
+with tempfile.TemporaryDirectory() as directory:
+    path = args.pages
+    if path is None:
+        path = directory
+        start = time.perf_counter()
+        fixtures.generate(path, fixtures.universe()[:max(args.count, args.batch)])
+        print("synthetic pages generated in {:.1f}s".format(time.perf_counter() - start), file=sys.stderr)
+
+    available = ReplayFetcher(path).ISINs()
+    if not available:
+        sys.exit("No recorded pages under {}".format(path))
+
+    results = {
+        "environment": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count(), "date": time.strftime("%Y-%m-%d %H:%M:%S")},
+        "cases": {},
+    }
+    for name in args.cases:
+        ISINs = available[:args.batch if name == "batch" else args.count]
+        output = subprocess.run([sys.executable, __file__, "--pages", path, "--case", name, "--repeat", str(args.repeat)],
+            input=json.dumps(ISINs), capture_output=True, text=True, check=True).stdout
+        results["cases"][name] = json.loads(output)
+        print("{} done".format(name), file=sys.stderr)
+
+from tabulate import tabulate
+
+table = [[name, result["count"], result["unit"], result["p50"] * 1e3, result["p95"] * 1e3, result["max"] * 1e3, result["total"], result["peak_memory"] / 1024, result["memory"] / 1024, result["allocated"] / 1024 ** 2]
+    for name, result in results["cases"].items()]
+print(tabulate(table, headers=["Case", "Count", "Per", "p50 (ms)", "p95 (ms)", "Max (ms)", "Total (s)", "Peak (MB)", "Above setup (MB)", "Allocated (MB)"], floatfmt=".2f"))
+
+if args.output:
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+if args.baseline:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(results, baseline, args.threshold, args.floor)
+    print("\n" + tabulate(rows, headers=["Case", "Time / baseline", "Memory / baseline", ""], floatfmt=".2f"))
+    if regressions:
+        print("\nregressions: {}".format(", ".join(regressions)))
+        sys.exit(1)
@@ -1 +1,64 @@
-language = "en"
\ No newline at end of file
+import os
+
+language = "en"
+
+# local data (equity index, scraped statements...) is stored under stocks/cache
+cache_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), "cache")
+
+# how long scraped data stays fresh, in seconds
+statements_ttl = 30 * 24 * 3600
+price_ttl = 15 * 60
+
+# keep every scraped statement under cache/history, see scrappers/investing/history.py
+history = True
+# a fiscal year of a country is compacted into a single segment once it holds more segments than this
+history_segments = 64
+
+# only use cached data, never touch the network
+offline = False
+
+# how pages are downloaded: "selenium" drives chrome, "http" fetches them without a browser
+fetcher = "selenium"
+# replaces https://www.investing.com with the http fetcher, e.g. http://localhost:8000
+origin = None
+
+# record the scraped pages to / replay them from this folder
+record = None
+replay = None
+
+# maximum time to wait for the annual statement to replace the quarterly one, in seconds
+annual_timeout = 10
+# maximum time to wait for a page to load in the browser, in seconds
+page_load_timeout = 30
+# read the tables in the browser and only transfer their cells, instead of the whole page source
+extract_in_browser = True
+# the browser doesn't download images, fonts, media nor the blocked urls, and pages are read as soon as their html is
+lean_browser = True
+# record the load time and the bytes transferred of each page, see benchmarks/browser_profile.py
+measure_loads = False
+# url patterns blocked by the lean browser, * matches anything
+blocked_urls = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*", "*google-analytics.com*",
+    "*googletagmanager.com*", "*googletagservices.com*", "*adnxs.com*", "*criteo.com*", "*criteo.net*",
+    "*taboola.com*", "*outbrain.com*", "*amazon-adsystem.com*", "*scorecardresearch.com*", "*quantserve.com*",
+    "*facebook.net*", "*hotjar.com*", "*teads.tv*", "*moatads.com*", "*pubmatic.com*", "*rubiconproject.com*",
+]
+
+# per host: (requests per second, burst), hosts not listed are not rate limited
+rate_limits = {"www.investing.com": (2, 5)}
+# maximum number of pages fetched at once from a host, the http fetcher keeps as many connections alive
+# and aio.load_equities refuses a higher concurrency
+host_concurrency = 4
+# attempts after a timeout, a dropped connection, a 429 or a 5xx response, waiting about backoff * 2^attempt seconds before each
+retries = 4
+backoff = 0.5
+max_backoff = 30
+# within a process, pages of "interactive" lookups are fetched before those of "bulk" loads,
+# each process has its own scheduler so a lookup doesn't go before the pages of a running screen
+priority = "interactive"
+
+# write the spans of each stage to this file as a chrome trace, also enabled by the STOCKS_TRACE environment variable
+trace = None
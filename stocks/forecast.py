@@ -0,0 +1,70 @@
+import warnings
+
+import numpy as np
+
+# trend lines fitted over one series or a company x year matrix at once,
+# missing values (NaN) are left out of each company's fit
+
+class Trend:
+
+    def __init__(self, slope, intercept, r2, count):
+        self.slope = slope
+        self.intercept = intercept
+        # coefficient of determination of the fit, NaN when it can't be told
+        self.r2 = r2
+        self.count = count
+
+    def estimate(self, x):
+        return self.slope * x + self.intercept
+
+def years(columns):
+    # "dd/mm/YYYY" periods to fiscal years
+    return np.array([int(column[-4:]) for column in columns], dtype=np.float64)
+
+def least_squares(x, y, mask, count):
+    x_mean = np.where(mask, x, 0).sum(axis=-1) / count
+    y_mean = np.where(mask, y, 0).sum(axis=-1) / count
+    dx = np.where(mask, x - x_mean[..., None], 0)
+    dy = np.where(mask, y - y_mean[..., None], 0)
+    slope = (dx * dy).sum(axis=-1) / (dx * dx).sum(axis=-1)
+    return slope, y_mean - slope * x_mean
+
+def theil_sen(x, y, mask):
+    # median of the slopes between every pair of years, then median of the intercepts
+    dx = x[..., None, :] - x[..., :, None]
+    dy = y[..., None, :] - y[..., :, None]
+    n = x.shape[-1]
+    pairs = np.triu(np.ones((n, n), dtype=bool), 1) & mask[..., None, :] & mask[..., :, None] & (dx != 0)
+    slopes = np.where(pairs, dy / np.where(pairs, dx, 1), np.nan).reshape(x.shape[:-1] + (n * n,))
+    with warnings.catch_warnings():
+        # companies without enough years get NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        slope = np.nanmedian(slopes, axis=-1)
+        intercept = np.nanmedian(np.where(mask, y - slope[..., None] * x, np.nan), axis=-1)
+    return slope, intercept
+
+def fit(values, x=None, robust=False):
+    # values: one series or a company x year matrix, most recent year first
+    # x: years of the values, by default positions relative to the most recent year (0, -1, -2...)
+    y = np.asarray(values, dtype=np.float64)
+    if x is None:
+        x = -np.arange(y.shape[-1], dtype=np.float64)
+    x = np.broadcast_to(np.asarray(x, dtype=np.float64), y.shape)
+    mask = ~np.isnan(x) & ~np.isnan(y)
+    count = mask.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if robust:
+            slope, intercept = theil_sen(x, y, mask)
+        else:
+            slope, intercept = least_squares(x, y, mask, count)
+        y_mean = np.where(mask, y, 0).sum(axis=-1) / count
+        residuals = np.where(mask, y - (slope[..., None] * x + intercept[..., None]), 0)
+        total = np.where(mask, y - y_mean[..., None], 0)
+        r2 = 1 - (residuals ** 2).sum(axis=-1) / (total ** 2).sum(axis=-1)
+    # a line needs at least two years
+    slope = np.where(count >= 2, slope, np.nan)
+    intercept = np.where(count >= 2, intercept, np.nan)
+    r2 = np.where(count >= 2, r2, np.nan)
+    if y.ndim == 1:
+        return Trend(slope[()], intercept[()], r2[()], int(count))
+    return Trend(slope, intercept, r2, count)
@@ -0,0 +1,61 @@
+import numpy as np
+
+# growth kernels over one series or a company x year matrix, most recent year first,
+# missing years are NaN and a growth over a zero is NaN too, never inf
+
+def yoy(series):
+    # growth of each year over the year before, relative to the size of the year before
+    series = np.asarray(series, dtype=np.float64)
+    current, previous = series[..., :-1], series[..., 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous != 0, (current - previous) / np.abs(previous), np.nan)
+
+def mean(values):
+    # mean over the last axis of the values that are not NaN, NaN when there are none
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 0, np.where(valid, values, 0).sum(axis=-1) / count, np.nan)
+
+def mean_growth(series):
+    # average year over year growth
+    return mean(yoy(series))
+
+def ends(series):
+    # the most recent and the oldest known values and the number of years between them, 0 when there are none
+    series = np.asarray(series, dtype=np.float64)
+    valid = ~np.isnan(series)
+    n = series.shape[-1]
+    latest_index = np.argmax(valid, axis=-1)
+    oldest_index = n - 1 - np.argmax(valid[..., ::-1], axis=-1)
+    latest = np.take_along_axis(series, np.expand_dims(latest_index, -1), axis=-1)[..., 0]
+    oldest = np.take_along_axis(series, np.expand_dims(oldest_index, -1), axis=-1)[..., 0]
+    periods = np.where(valid.any(axis=-1), oldest_index - latest_index, 0)
+    return latest, oldest, periods
+
+def known(series):
+    # number of known years
+    return (~np.isnan(np.asarray(series, dtype=np.float64))).sum(axis=-1)
+
+def cagr(series):
+    # compound annual growth rate between the oldest and the most recent known years,
+    # NaN unless both are known and distinct, and only defined for these signs:
+    # - the oldest is positive, there is no rate from a loss or from nothing
+    # - the latest is not negative, a profit that turned into a loss has no rate either
+    # a growth screen should fail a series with a NaN rate rather than skip it, see known
+    latest, oldest, periods = ends(series)
+    defined = (periods > 0) & (oldest > 0) & (latest >= 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(defined, (latest / oldest) ** (1 / periods) - 1, np.nan)
+
+def consistency(series):
+    # how steadily the series moves one way: 1 when it rises every year, -1 when it falls every year
+    return mean(np.sign(yoy(series)))
+
+def co_movement(a, b):
+    # share of the years where both series move the same way, over the years known for both
+    growth_a, growth_b = yoy(a), yoy(b)
+    width = min(growth_a.shape[-1], growth_b.shape[-1])
+    growth_a, growth_b = growth_a[..., :width], growth_b[..., :width]
+    same = np.where(np.isnan(growth_a) | np.isnan(growth_b), np.nan, np.sign(growth_a) == np.sign(growth_b))
+    return mean(same)
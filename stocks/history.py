@@ -0,0 +1,34 @@
+import argparse
+import sys
+
+from scrappers.investing import history
+
+parser = argparse.ArgumentParser(description="Look up a statement row of every company of a country over the years, from the statements scraped so far")
+parser.add_argument("country", help="Country code (e.g. FR)")
+parser.add_argument("labels", nargs="*", help="Statement rows, e.g. \"Net Income\"")
+parser.add_argument("-y", "--years", type=int, nargs=2, metavar=("FIRST", "LAST"), help="Fiscal years, both included")
+parser.add_argument("-s", "--statement", choices=history.statements, help="Only look in this statement")
+parser.add_argument("--all", action="store_true", help="Every scraped version of the figures instead of the last one")
+parser.add_argument("--compact", action="store_true", help="Merge the stored segments first, which makes reads faster")
+parser.add_argument("--format", choices=["table", "csv"], default="table", help="One row per company and label, or every stored row as CSV")
+args = parser.parse_args()
+
+if args.compact:
+    print("{} segments merged".format(history.compact(args.country)), file=sys.stderr)
+if not args.labels:
+    sys.exit()
+
+data = history.read(args.country, args.labels, args.years, statement=args.statement, latest=not args.all)
+if not len(data):
+    sys.exit("Nothing scraped for {} in {}".format(", ".join(args.labels), args.country.upper()))
+if args.format == "csv" or args.all:
+    data.to_csv(sys.stdout, index=False)
+    sys.exit()
+
+from tabulate import tabulate
+
+# fiscal years as columns, the most recent first as in the statements
+data["year"] = data["period"].str[-4:]
+table = data.pivot_table(index=["ISIN", "label"], columns="year", values="value", aggfunc="last")
+table = table[sorted(table.columns, reverse=True)].reset_index()
+print(tabulate(table, headers="keys", showindex=False, floatfmt=".2f"))
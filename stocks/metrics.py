@@ -0,0 +1,193 @@
+import weakref
+from collections import Counter
+
+import numpy as np
+
+# field: (statement, accessor) of the rows read from the equity statements
+fields = {
+    # income statement
+    "revenue": ("income_statement", "total_revenue"),
+    "gross_profit": ("income_statement", "gross_profit"),
+    "sga": ("income_statement", "selling_general_administrative_expenses"),
+    "interest_expense": ("income_statement", "interest_expense"),
+    "interest_income": ("income_statement", "interest_income"),
+    "operating_income": ("income_statement", "operating_income"),
+    "net_income": ("income_statement", "net_income"),
+    "ebit": ("income_statement", "net_income_before_taxes"),
+    "earnings": ("income_statement", "net_income_after_taxes"),
+    "net_income_to_common": ("income_statement", "income_available_to_common_excluding_extraordinary_items"),
+    "provision_for_income_taxes": ("income_statement", "provision_for_income_taxes"),
+    "depreciation_amortization": ("income_statement", "depreciation_amortization"),
+    # balance sheet
+    "current_assets": ("balance_sheet", "total_current_assets"),
+    "current_liabilities": ("balance_sheet", "total_current_liabilities"),
+    "total_assets": ("balance_sheet", "total_assets"),
+    "stockholder_equity": ("balance_sheet", "total_equity"),
+    "cash": ("balance_sheet", "cash_and_equivalents"),
+    "short_term_investments": ("balance_sheet", "short_term_investments"),
+    "accounts_receivable": ("balance_sheet", "accounts_receivable"),
+    "inventory": ("balance_sheet", "total_inventory"),
+    "ppe": ("balance_sheet", "total_property_plant_equipment"),
+    "short_term_debt": ("balance_sheet", "short_term_debt"),
+    "long_term_debt": ("balance_sheet", "total_long_term_debt"),
+    "shares": ("balance_sheet", "total_common_shares_outstanding"),
+    # cash flow
+    "capex": ("cash_flow", "capital_expenditures"),
+    "depreciation": ("cash_flow", "depreciation"),
+    # ratios
+    "price_to_sales": ("ratios", "price_to_sales_ttm"),
+}
+
+# name: (function, dependencies) of the metrics derived from the latest values of the fields,
+# shared by the report (one company) and the picker rules (a panel of companies): functions take arrays
+# where missing values are 0 and return when(available, value)
+derived = {}
+
+def metric(*dependencies):
+    def register(function):
+        derived[function.__name__] = (function, dependencies)
+        return function
+    return register
+
+def when(available, value):
+    # the metric only exists where available holds, like the "if a and b:" of scalar code
+    return np.where(available, value, np.nan), np.broadcast_to(available, np.shape(value))
+
+def inputs(name):
+    # fields and price a metric is computed from
+    if name not in derived:
+        return {name}
+    return set().union(*[inputs(dependency) for dependency in derived[name][1]])
+
+def compute(name, lookup):
+    # lookup(dependency) returns the (values, available) arrays of a field, of the price or of another metric
+    function, dependencies = derived[name]
+    arguments = []
+    for dependency in dependencies:
+        values, available = lookup(dependency)
+        arguments.append(np.where(available, values, 0))
+    with np.errstate(all="ignore"):
+        return function(*arguments)
+
+## valuation
+@metric("shares", "price")
+def market_cap(shares, price):
+    return when(shares != 0, shares * price)
+
+@metric("net_income", "interest_income", "provision_for_income_taxes", "depreciation_amortization")
+def ebitda(net_income, interest_income, provision_for_income_taxes, depreciation_amortization):
+    return when((net_income != 0) & (interest_income != 0) & (provision_for_income_taxes != 0) & (depreciation_amortization != 0),
+        net_income + interest_income + provision_for_income_taxes + depreciation_amortization)
+
+@metric("short_term_debt", "long_term_debt", "market_cap", "cash")
+def enterprise_value(short_term_debt, long_term_debt, market_cap, cash):
+    return when((short_term_debt != 0) & (long_term_debt != 0) & (market_cap != 0) & (cash != 0),
+        market_cap + (short_term_debt + long_term_debt) - cash)
+
+@metric("enterprise_value", "ebitda")
+def ev_ebitda(enterprise_value, ebitda):
+    return when((enterprise_value != 0) & (ebitda != 0), enterprise_value / ebitda)
+
+@metric("ebit", "enterprise_value")
+def ebit_ev(ebit, enterprise_value):
+    return when((enterprise_value != 0) & (ebit != 0), ebit / enterprise_value)
+
+@metric("shares", "net_income_to_common", "net_income")
+def basic_eps(shares, net_income_to_common, net_income):
+    # the net income available to common shareholders, the net income otherwise
+    return when((shares != 0) & ((net_income_to_common != 0) | (net_income != 0)),
+        np.where(net_income_to_common != 0, net_income_to_common, net_income) / shares)
+
+@metric("market_cap", "shares", "basic_eps")
+def per(market_cap, shares, basic_eps):
+    return when((shares != 0) & (basic_eps != 0) & (market_cap != 0), (market_cap / shares) / basic_eps)
+
+## profitability
+@metric("gross_profit", "revenue")
+def gross_margin(gross_profit, revenue):
+    return when((gross_profit != 0) & (revenue != 0), gross_profit / revenue * 100)
+
+@metric("operating_income", "revenue")
+def operating_margin(operating_income, revenue):
+    return when((operating_income != 0) & (revenue != 0), operating_income / revenue * 100)
+
+@metric("net_income", "revenue")
+def net_margin(net_income, revenue):
+    return when((net_income != 0) & (revenue != 0), net_income / revenue * 100)
+
+## management effectiveness
+@metric("net_income", "total_assets")
+def roa(net_income, total_assets):
+    return when((net_income != 0) & (total_assets != 0), net_income / total_assets * 100)
+
+@metric("total_assets", "current_liabilities", "ebit")
+def roce(total_assets, current_liabilities, ebit):
+    return when((total_assets != 0) & (current_liabilities != 0) & (ebit != 0), ebit / (total_assets - current_liabilities) * 100)
+
+@metric("net_income", "stockholder_equity")
+def roe(net_income, stockholder_equity):
+    return when((net_income != 0) & (stockholder_equity != 0), net_income / stockholder_equity * 100)
+
+## balance sheet
+@metric("current_assets", "current_liabilities")
+def current_ratio(current_assets, current_liabilities):
+    return when((current_assets != 0) & (current_liabilities != 0), current_assets / current_liabilities)
+
+@metric("cash", "short_term_investments", "accounts_receivable", "current_liabilities")
+def quick_ratio(cash, short_term_investments, accounts_receivable, current_liabilities):
+    return when((cash != 0) & (short_term_investments != 0) & (accounts_receivable != 0) & (current_liabilities != 0),
+        (cash + short_term_investments + accounts_receivable) / current_liabilities)
+
+class Metrics:
+
+    def __init__(self, equity):
+        self.equity = equity
+        self.__values = {}
+        self.__series = {}
+        # number of times each metric was computed and then served from the cache
+        self.computed = Counter()
+        self.hits = Counter()
+
+    def series(self, field):
+        key = field + " (series)"
+        if field in self.__series:
+            self.hits[key] += 1
+            return self.__series[field]
+        statement, accessor = fields[field]
+        series = getattr(getattr(self.equity, statement), accessor)()
+        self.__series[field] = series
+        self.computed[key] += 1
+        return series
+
+    def __getitem__(self, name):
+        if name in self.__values:
+            self.hits[name] += 1
+            return self.__values[name]
+        if name == "price":
+            value = self.equity.price
+        elif name in fields:
+            series = self.series(name)
+            value = None if series is None else series[0]
+        elif name in derived:
+            value, available = compute(name, self.__lookup)
+            value = float(value) if available else None
+        else:
+            raise Exception("Unknown metric: {}".format(name))
+        self.__values[name] = value
+        self.computed[name] += 1
+        return value
+
+    def __lookup(self, name):
+        value = self[name]
+        return (0.0, False) if value is None else (value, True)
+
+    def stats(self):
+        return [(name, self.computed[name], self.hits[name]) for name in sorted(self.computed)]
+
+# one graph per equity, shared by every consumer and dropped with the equity
+_graphs = weakref.WeakKeyDictionary()
+
+def of(equity):
+    if equity not in _graphs:
+        _graphs[equity] = Metrics(equity)
+    return _graphs[equity]
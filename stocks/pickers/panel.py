@@ -0,0 +1,89 @@
+import metrics
+import numpy as np
+from metrics import fields
+
+class Panel:
+
+    def __init__(self, ISINs, names, price, values, masks, lengths, graphs=None):
+        # values[field] is a company x year matrix, most recent year first, padded with NaN
+        # masks[field] tells whether the statement has the row at all
+        # lengths[field] is the number of years of the row
+        # graphs are the metric graphs of the equities the panel was built from
+        self.ISINs = ISINs
+        self.names = names
+        self.price = price
+        self.values = values
+        self.masks = masks
+        self.lengths = lengths
+        self.graphs = graphs
+
+    def __len__(self):
+        return len(self.ISINs)
+
+    def latest(self, field):
+        return self.column(field)[:, 0]
+
+    def series(self, field):
+        return self.column(field)
+
+    def present(self, field):
+        self.column(field)
+        return self.masks[field]
+
+    def truthy(self, field):
+        # what "if value:" means for the scalar pickers: present and not zero, NaN included
+        return self.present(field) & (self.latest(field) != 0)
+
+    def column(self, field):
+        # metrics of metrics.py are computed from the fields on first use, as a single year
+        if field not in self.values and field in metrics.derived:
+            if self.graphs is not None and len(self) == 1:
+                # a single equity reads the value of its metric graph, computed there once for every consumer
+                value = self.graphs[0][field]
+                value, available = np.array([np.nan if value is None else value]), np.array([value is not None])
+            else:
+                value, available = metrics.compute(field, self.__lookup)
+            self.values[field] = value[:, None]
+            self.masks[field] = np.array(available)
+            self.lengths[field] = self.masks[field].astype(np.int64)
+        return self.values[field]
+
+    def __lookup(self, name):
+        if name == "price":
+            return self.price, np.ones(len(self), dtype=bool)
+        return self.latest(name), self.present(name)
+
+    @classmethod
+    def from_equities(cls, equities, subset=None):
+        # subset restricts the panel to some fields, the other statements are not loaded
+        subset = list(fields) if subset is None else subset
+        rows = {field: [] for field in subset}
+        graphs = []
+        for equity in equities:
+            # rows are read through the metric graph of the equity, shared with the other consumers
+            graph = metrics.of(equity)
+            graphs.append(graph)
+            for field in subset:
+                series = graph.series(field)
+                rows[field].append(None if series is None else np.asarray(series, dtype=np.float64))
+
+        n = len(equities)
+        values = {}
+        masks = {}
+        lengths = {}
+        for field, series in rows.items():
+            width = max([len(row) for row in series if row is not None] + [1])
+            values[field] = np.full((n, width), np.nan)
+            masks[field] = np.zeros(n, dtype=bool)
+            lengths[field] = np.zeros(n, dtype=np.int64)
+            for i, row in enumerate(series):
+                if row is None:
+                    continue
+                values[field][i, :len(row)] = row
+                masks[field][i] = True
+                lengths[field][i] = len(row)
+
+        ISINs = [equity.ISIN for equity in equities]
+        names = [equity.name for equity in equities]
+        price = np.array([equity.price for equity in equities], dtype=np.float64)
+        return cls(ISINs, names, price, values, masks, lengths, graphs)
@@ -0,0 +1,237 @@
+import config
+import forecast
+import growth
+import metrics
+import numpy as np
+from utils import trace
+from utils.translate import translator
+
+from pickers.panel import Panel, fields
+
+operators = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+class Rule:
+
+    def __init__(self, name, metric, threshold=None, approved=None, when=None, details=None, pros=(), cons=(), notes=(), undefined=()):
+        # metric, approved, when and details are expressions over the panel:
+        # a field name is its latest value, the metrics of metrics.py and price are available too,
+        # as well as present(field), truthy(field), series(field), length(field), trend(series) and the growth kernels
+        # threshold is an (operator, value) pair, approved an expression over value when the test is not a single threshold
+        # when may use value as well and defaults to "every field used by the metric is there and not zero", like the scalar "if a and b:",
+        # and every metric used is available
+        # messages are tuples alternating text to translate and text formatted with value and the details
+        # notes are ((operator, value), message) added to the pros or cons when the value passes their test
+        # undefined replaces the cons when the rule is evaluated but its value is NaN
+        self.name = name
+        self.threshold = threshold
+        self.pros = pros
+        self.cons = cons
+        self.notes = notes
+        self.undefined = undefined
+        self.metric = compile(metric, name, "eval")
+        self.approved = None if approved is None else compile(approved, name, "eval")
+        if when is None:
+            when = " & ".join("{}('{}')".format("present" if field in metrics.derived else "truthy", field) for field in names(self.metric)) or "True"
+        self.when = compile(when, name, "eval")
+        self.details = {key: compile(expression, name, "eval") for key, expression in (details or {}).items()}
+        # the fields and metrics used, and the fields they are computed from
+        self.names = set()
+        for code in [self.metric, self.approved, self.when] + list(self.details.values()):
+            if code is not None:
+                self.names |= references(code)
+        inputs = set().union(*[metrics.inputs(name) for name in self.names])
+        self.fields = inputs - {"price"}
+        # trailing ratios are downloaded again when the price moved
+        self.uses_price = "price" in inputs or any(fields[field][0] == "ratios" for field in self.fields)
+
+    def evaluate(self, namespace):
+        value = eval(self.metric, namespace)
+        namespace = dict(namespace, value=value)
+        evaluated = np.broadcast_to(eval(self.when, namespace), value.shape)
+        if self.approved is None:
+            operator, threshold = self.threshold
+            approved = operators[operator](value, threshold)
+        else:
+            approved = eval(self.approved, namespace)
+        details = {key: eval(code, namespace) for key, code in self.details.items()}
+        return evaluated, approved, value, details
+
+def names(code):
+    return [name for name in code.co_names if name in fields or name in metrics.derived]
+
+def references(code):
+    used = set(names(code)) | {constant for constant in code.co_consts if isinstance(constant, str) and (constant in fields or constant in metrics.derived)}
+    if "price" in code.co_names:
+        used.add("price")
+    return used
+
+def render(message, context, tr):
+    return "".join(tr(part) if i % 2 == 0 else part.format(**context) for i, part in enumerate(message))
+
+class Scores:
+
+    def __init__(self, criteria):
+        # criteria: name -> (evaluated, approved, value)
+        self.criteria = criteria
+        self.n_evaluated = sum(evaluated.astype(np.int64) for evaluated, _, _ in criteria.values())
+        self.n_approved = sum((evaluated & approved).astype(np.int64) for evaluated, approved, _ in criteria.values())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # NaN when nothing could be evaluated, a single equity gets None
+            self.score = np.where(self.n_evaluated > 0, self.n_approved * 10 / self.n_evaluated, np.nan)
+
+class Verdict:
+
+    def __init__(self, rule, approved, value, details):
+        self.rule = rule
+        self.approved = approved
+        self.value = value
+        self.details = details
+
+    def as_dict(self):
+        return {"rule": self.rule, "approved": self.approved, "value": number(self.value), "details": self.details}
+
+class Result:
+
+    def __init__(self, picker, score, n_evaluated, n_approved, verdicts):
+        # verdicts of the rules that could be evaluated, score is None when there are none
+        self.picker = picker
+        self.score = score
+        self.n_evaluated = n_evaluated
+        self.n_approved = n_approved
+        self.verdicts = verdicts
+
+    def as_dict(self):
+        return {
+            "picker": self.picker,
+            "score": self.score,
+            "n_evaluated": self.n_evaluated,
+            "n_approved": self.n_approved,
+            "rules": [verdict.as_dict() for verdict in self.verdicts],
+        }
+
+def number(value):
+    # plain python values, NaN becomes None
+    value = value.item() if hasattr(value, "item") else value
+    return None if value != value else value
+
+class Evaluation(Scores):
+
+    def __init__(self, profile, panel, results):
+        super().__init__({name: result[:3] for name, result in results.items()})
+        self.profile = profile
+        self.panel = panel
+        self.results = results
+
+    def __getitem__(self, i):
+        return number(self.score[i])
+
+    def result(self, i):
+        verdicts = []
+        for rule in self.profile.rules:
+            evaluated, approved, value, details = self.results[rule.name]
+            if evaluated[i]:
+                details = {key: number(detail[i]) for key, detail in details.items()}
+                verdicts.append(Verdict(rule.name, bool(approved[i]), float(value[i]), details))
+        return Result(self.profile.name, self[i], int(self.n_evaluated[i]), int(self.n_approved[i]), verdicts)
+
+class Profile:
+
+    def __init__(self, name, rules, verdicts, inclusive=False):
+        # verdicts: what is printed when some, most or none of the criteria are met,
+        # inclusive tells whether "some" includes its bounds
+        self.name = name
+        self.rules = rules
+        self.rules_by_name = {rule.name: rule for rule in rules}
+        self.verdicts = verdicts
+        self.inclusive = inclusive
+        self.fields = sorted(set().union(*[rule.fields for rule in rules]))
+        self.names = sorted(set().union(*[rule.names for rule in rules]) - {"price"})
+        # whether the score has to be computed again when only the price changed
+        self.uses_price = any(rule.uses_price for rule in rules)
+
+    def namespace(self, panel):
+        namespace = {
+            "present": panel.present,
+            "truthy": panel.truthy,
+            "series": panel.series,
+            "length": lambda field: panel.lengths[field],
+            "price": panel.price,
+            "abs": np.abs,
+            "yoy": growth.yoy,
+            "mean_growth": growth.mean_growth,
+            "cagr": growth.cagr,
+            "known": growth.known,
+            "consistency": growth.consistency,
+            "co_movement": growth.co_movement,
+            "trend": forecast.fit,
+        }
+        for name in self.names:
+            namespace[name] = panel.latest(name)
+        return namespace
+
+    def evaluate(self, panel):
+        with trace.span(f"picker.{self.name}"):
+            namespace = self.namespace(panel)
+            with np.errstate(all="ignore"):
+                results = {rule.name: rule.evaluate(namespace) for rule in self.rules}
+        return Evaluation(self, panel, results)
+
+    def evaluate_equities(self, equities):
+        # only the statements used by the rules are loaded
+        return self.evaluate(Panel.from_equities(equities, self.fields))
+
+    def summary(self, result, tr):
+        # messages are only rendered here, when a report is printed
+        pros = []
+        cons = []
+        for verdict in result.verdicts:
+            rule = self.rules_by_name[verdict.rule]
+            context = dict(verdict.details, value=verdict.value)
+            summary = pros if verdict.approved else cons
+            message = rule.pros if verdict.approved else rule.cons
+            if rule.undefined and verdict.value != verdict.value:
+                message = rule.undefined
+            summary.append(render(message, context, tr))
+            for (operator, threshold), message in rule.notes:
+                if operators[operator](verdict.value, threshold):
+                    summary.append(render(message, context, tr))
+        return pros, cons
+
+    def render(self, result, company_name, tr):
+        some, most, none = self.verdicts
+        ratio = result.n_approved / result.n_evaluated
+        if self.inclusive and ratio >= 0.5 and ratio <= 0.7 or not self.inclusive and ratio > 0.5 and ratio < 0.7:
+            verdict = some
+        elif ratio > 0.7:
+            verdict = most
+        else:
+            verdict = none
+        pros, cons = self.summary(result, tr)
+        return "\n".join([
+            "\n" + tr("The stock value of") + " {} ".format(company_name) + tr(verdict),
+            "\n" + tr("Recommendation") + " {:.2f}/10".format(result.score),
+            tr("Pros") + ": {}".format("".join("\n-" + message for message in pros)),
+            tr("Cons") + ": {}".format("".join("\n-" + message for message in cons)),
+        ])
+
+class Picker:
+
+    # set by each investor profile
+    profile = None
+
+    def __init__(self, equity):
+        self.equity = equity
+
+    def result(self):
+        return self.profile.evaluate_equities([self.equity]).result(0)
+
+    def evaluation(self, verbose=True):
+        result = self.result()
+        if verbose and result.score is not None:
+            print(self.profile.render(result, self.equity.name, translator(config.language)))
+        return result.score
@@ -0,0 +1,83 @@
+import argparse
+import functools
+import sys
+import time
+from collections import Counter
+
+from utils import trace
+from utils.translate import translator
+import scrappers.investing as inv
+from scrappers.investing import cache
+from screen import universe, worker_settings, usage, run, pickers
+
+# what each refresh status means for the scores
+statuses = {
+    "parsed": "re-parsed",
+    "reparsed": "re-parsed",
+    "refreshed": "refreshed",
+    "skipped": "skipped",
+    "failed": "failed",
+}
+
+def refresh(ISIN, full=False):
+    import report
+    from pickers.rules import number
+
+    start = time.perf_counter()
+    equity = None
+    try:
+        with trace.span("refresh", ISIN=ISIN):
+            equity = inv.Equity(ISIN)
+            if full:
+                cache.clear(equity.ISIN)
+            status = equity.refresh()
+            # the analysis of the previous run is kept along with the statements
+            analysis = cache.read(equity.ISIN, "analysis", float("inf"))
+            if analysis is None or status in ("parsed", "reparsed"):
+                analysis = report.analyse(equity, pickers, with_fundamentals=False)
+            elif status == "refreshed":
+                # only the scores depending on the price are computed again
+                analysis.price = number(equity.price)
+                for name in pickers:
+                    if name not in analysis.pickers or report.profiles[name].uses_price:
+                        analysis.pickers[name] = report.profiles[name].evaluate_equities([equity]).result(0)
+            cache.write(equity.ISIN, "analysis", analysis)
+    except Exception as e:
+        # a single equity must not stop the whole refresh
+        analysis = report.Analysis(ISIN, error=f"{type(e).__name__}: {e}")
+        status = "failed"
+    return analysis, status, time.perf_counter() - start, usage(equity)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the analysis of many companies, only downloading what changed since the last run")
+    parser.add_argument("targets", nargs="+", help="Country codes (e.g. FR), files of ISINs or ISINs")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Number of worker processes, each with its own browser")
+    parser.add_argument("-n", "--limit", type=int, default=None, help="Only refresh the first N equities")
+    parser.add_argument("-l", "--language", default="en", help="Language")
+    parser.add_argument("-f", "--fetcher", choices=["selenium", "http"], default="selenium", help="Download pages with chrome or without a browser")
+    parser.add_argument("--origin", metavar="URL", help="Fetch pages from this server instead of investing.com with the http fetcher")
+    parser.add_argument("--full", action="store_true", help="Download and parse everything again")
+    parser.add_argument("--trace", metavar="FILE", help="Time each stage in every worker and write a chrome trace to this file")
+    parser.add_argument("--format", choices=["table", "json", "csv"], default="table",
+        help="Rank the companies in a table once done, or stream each analysis as JSON lines or CSV rows as it completes")
+    args = parser.parse_args()
+
+    import report
+
+    tr = translator(args.language)
+    trace.enable(args.trace)
+    settings = worker_settings(args.workers, language=args.language, fetcher=args.fetcher, origin=args.origin)
+
+    ISINs = universe(args.targets)[:args.limit]
+    if not ISINs:
+        parser.error("no equity to refresh")
+
+    stream = None if args.format == "table" else report.writer(args.format, sys.stdout, tr, with_fundamentals=False)
+    counts = Counter()
+    elapsed = run(functools.partial(refresh, full=args.full), ISINs, args.workers, settings, stream, tr,
+        seen=lambda result: counts.update([statuses[result[1]]]))
+
+    print("\n{} equities in {:.1f}s: {} skipped, {} refreshed, {} re-parsed, {} failed".format(
+        len(ISINs), elapsed, counts["skipped"], counts["refreshed"], counts["re-parsed"], counts["failed"]), file=sys.stderr)
+
+    trace.save(sys.stderr)
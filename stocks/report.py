@@ -0,0 +1,215 @@
+import csv
+import json
+
+import forecast
+import metrics
+from pickers import buffet, mayer, slater
+from pickers.rules import number, operators
+from utils import trace
+
+profiles = {profile.name: profile for profile in (buffet.profile, mayer.profile, slater.profile)}
+
+# metric: ((operator, threshold, rating) tried in order, rating otherwise) of the rated metrics
+ratings = {
+    "ev_ebitda": ([("<", 11, "excellent"), ("<", 14, "good")], "bad"),
+    "per": ([("<=", 10, "excellent"), ("<=", 12, "good")], "bad"),
+    "roa": ([(">", 10, "excellent"), (">", 5, "good")], "bad"),
+    "roce": ([(">", 20, "excellent")], None),
+    "roe": ([(">", 20, "excellent"), (">=", 15, "good")], "bad"),
+    "current_ratio": ([(">", 1.5, "good"), ("<", 1, "very bad")], "bad"),
+    "quick_ratio": ([(">", 1.5, "excellent"), (">", 1, "good")], "bad"),
+}
+
+def rate(name, value):
+    if name not in ratings:
+        return None
+    levels, otherwise = ratings[name]
+    for operator, threshold, rating in levels:
+        if operators[operator](value, threshold):
+            return rating
+    return otherwise
+
+# section: (metric, label to translate, format) of the text report
+sections = [
+    ("Profitability", [
+        ("gross_margin", "Gross margin", " (TTM): {value:.2f}%"),
+        ("operating_margin", "Operating margin", " (TTM): {value:.2f}%"),
+        ("net_margin", "Net margin", " (TTM): {value:.2f}%"),
+    ]),
+    ("Overral financial performance", [
+        ("ev_ebitda", None, "EV/EBITDA: {value:.2f} -> {rating}"),
+        ("ebit_ev", None, "EBIT/EV: {value:.2f}x"),
+        ("per", None, "P/E Ratio: {value:.2f} -> {rating}"),
+    ]),
+    ("Management effectivness", [
+        ("roa", None, "ROA (TTM): {value:.2f}% -> {rating}"),
+        ("roce", None, "ROCE (TTM): {value:.2f}% -> {rating}"),
+        ("roe", None, "ROE (TTM): {value:.2f}% -> {rating}"),
+    ]),
+    ("Balance sheet", [
+        ("current_ratio", "Current ratio", " (TTM): {value:.2f} -> {rating}"),
+        ("quick_ratio", None, "QR (TTM): {value:.2f} -> {rating}"),
+    ]),
+]
+
+report_metrics = [metric for _, entries in sections for metric, _, _ in entries]
+
+class Fundamentals:
+
+    def __init__(self, revenue, estimate, metrics):
+        # revenue: (year, value) oldest first
+        # estimate: next year revenue, {"year", "value", "r2"} or None
+        # metrics: name -> {"value", "rating"} of the metrics that could be computed
+        # missing values stay NaN here and become None in as_dict
+        self.revenue = revenue
+        self.estimate = estimate
+        self.metrics = metrics
+
+    def as_dict(self):
+        return {
+            "revenue": [{"year": year, "value": number(value)} for year, value in self.revenue],
+            "estimate": None if self.estimate is None else {key: number(value) for key, value in self.estimate.items()},
+            "metrics": {name: dict(metric, value=number(metric["value"])) for name, metric in self.metrics.items()},
+        }
+
+class Analysis:
+
+    def __init__(self, ISIN, name=None, price=None, fundamentals=None, pickers=None, error=None):
+        self.ISIN = ISIN
+        self.name = name
+        self.price = price
+        self.fundamentals = fundamentals
+        # picker name -> rules.Result
+        self.pickers = {} if pickers is None else pickers
+        self.error = error
+
+    def as_dict(self):
+        return {
+            "ISIN": self.ISIN,
+            "name": self.name,
+            "price": self.price,
+            "fundamentals": None if self.fundamentals is None else self.fundamentals.as_dict(),
+            "pickers": {name: result.as_dict() for name, result in self.pickers.items()},
+            "error": self.error,
+        }
+
+def fundamentals(equity, robust=False):
+    graph = metrics.of(equity)
+    income_statement = equity.income_statement
+    annual_revenue = graph.series("revenue")
+
+    # next year revenue from the revenue trend
+    periods = forecast.years(income_statement.columns)
+    trend = forecast.fit(annual_revenue, periods, robust=robust)
+    estimate = None
+    if trend.count >= 3:
+        next_year = int(periods[0]) + 1
+        estimate = {"year": next_year, "value": float(trend.estimate(next_year)), "r2": float(trend.r2)}
+    revenue = [(column[-4:], annual_revenue[i]) for i, column in reversed(list(enumerate(income_statement.columns)))]
+
+    values = {}
+    for name in report_metrics:
+        value = graph[name]
+        if value:
+            values[name] = {"value": float(value), "rating": rate(name, value)}
+    return Fundamentals(revenue, estimate, values)
+
+def analyse(equity, pickers=tuple(profiles), with_fundamentals=True, robust=False):
+    result = Analysis(equity.ISIN, equity.name, number(equity.price))
+    if with_fundamentals:
+        with trace.span("report.fundamentals"):
+            result.fundamentals = fundamentals(equity, robust)
+    for name in pickers:
+        result.pickers[name] = profiles[name].evaluate_equities([equity]).result(0)
+    return result
+
+## renderers, each one writes a record as soon as it is given one
+
+def text(analysis, tr):
+    # the report as it has always been printed
+    from tabulate import tabulate
+    from utils.millify import millify
+
+    if analysis.error is not None:
+        return "{}: {}".format(analysis.ISIN, analysis.error)
+    lines = []
+    result = analysis.fundamentals
+    if result is not None:
+        lines.append("\n" + tr("Fundamental analysis of") + " {} :\n".format(analysis.name))
+        if result.estimate is not None:
+            headers = [year for year, _ in result.revenue] + ["Est. {}".format(result.estimate["year"])]
+            row = [value for _, value in result.revenue] + [millify(result.estimate["value"])]
+            lines.append("\n* " + tr("Change in net income") + ":\n\n+" + tabulate([row], headers=headers))
+            lines.append("R²: {:.2f}\n".format(result.estimate["r2"]))
+        for i, (section, entries) in enumerate(sections):
+            lines.append(("\n" if i > 0 else "") + tr(section) + ":")
+            for name, label, line in entries:
+                if name not in result.metrics:
+                    continue
+                value, rating = result.metrics[name]["value"], result.metrics[name]["rating"]
+                line = line.format(value=value, rating="..." if rating is None else tr(rating))
+                lines.append(line if label is None else tr(label) + line)
+    for name, picker_result in analysis.pickers.items():
+        if picker_result.score is not None:
+            lines.append(profiles[name].render(picker_result, analysis.name, tr))
+    return "\n".join(lines)
+
+class TextWriter:
+
+    def __init__(self, stream, tr):
+        self.stream = stream
+        self.tr = tr
+
+    def write(self, analysis):
+        print(text(analysis, self.tr), file=self.stream, flush=True)
+
+class JsonLinesWriter:
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, analysis):
+        self.stream.write(json.dumps(analysis.as_dict(), ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+class CsvWriter:
+
+    def __init__(self, stream, pickers=tuple(profiles), with_fundamentals=True):
+        # one flat row per equity, the columns are known before the first one
+        self.stream = stream
+        self.pickers = pickers
+        self.with_fundamentals = with_fundamentals
+        columns = ["ISIN", "name", "price", "error"]
+        if with_fundamentals:
+            columns += ["estimate_year", "estimate", "estimate_r2"] + report_metrics
+        for name in pickers:
+            columns += ["{}.score".format(name), "{}.n_approved".format(name), "{}.n_evaluated".format(name)]
+            columns += ["{}.{}".format(name, rule.name) for rule in profiles[name].rules]
+        self.columns = columns
+        self.writer = csv.DictWriter(stream, fieldnames=columns)
+        self.writer.writeheader()
+        self.stream.flush()
+
+    def write(self, analysis):
+        row = {"ISIN": analysis.ISIN, "name": analysis.name, "price": analysis.price, "error": analysis.error}
+        result = analysis.fundamentals
+        if result is not None:
+            if result.estimate is not None:
+                row.update({"estimate_year": result.estimate["year"], "estimate": result.estimate["value"], "estimate_r2": result.estimate["r2"]})
+            row.update({name: metric["value"] for name, metric in result.metrics.items()})
+        for name, picker_result in analysis.pickers.items():
+            row["{}.score".format(name)] = picker_result.score
+            row["{}.n_approved".format(name)] = picker_result.n_approved
+            row["{}.n_evaluated".format(name)] = picker_result.n_evaluated
+            for verdict in picker_result.verdicts:
+                # 1 approved, 0 not approved, empty when not evaluated
+                row["{}.{}".format(name, verdict.rule)] = int(verdict.approved)
+        self.writer.writerow(row)
+        self.stream.flush()
+
+def writer(output_format, stream, tr=None, **kwargs):
+    if output_format == "json":
+        return JsonLinesWriter(stream)
+    if output_format == "csv":
+        return CsvWriter(stream, **kwargs)
+    return TextWriter(stream, tr)
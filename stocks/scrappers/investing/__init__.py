@@ -1 +1 @@
-from .equity import Equity
\ No newline at end of file
+from .equity import Equity
@@ -0,0 +1,38 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from . import fetchers
+from .equity import Equity, statements
+
+async def load_equity(ISIN, names=statements, fetcher=None):
+    return await Equity(ISIN, fetcher).load_async(names)
+
+async def load_equities(ISINs, names=statements, concurrency=None, fetcher=None):
+    # yields (ISIN, equity, error) as soon as each equity is loaded,
+    # with at most concurrency pages being fetched at any time, config.host_concurrency by default:
+    # the scheduler never fetches more pages of a host at once, so more than that is refused rather than ignored
+    if concurrency is None:
+        concurrency = config.host_concurrency
+    network = (fetchers.default() if fetcher is None else fetcher).network
+    if network and concurrency > config.host_concurrency:
+        raise ValueError(f"A concurrency of {concurrency} is above config.host_concurrency ({config.host_concurrency}), raise it as well")
+    semaphore = asyncio.Semaphore(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def load(ISIN):
+        try:
+            equity = Equity(ISIN, fetcher)
+            await equity.load_async(names, semaphore, executor)
+            return ISIN, equity, None
+        except Exception as e:
+            return ISIN, None, e
+
+    tasks = [asyncio.ensure_future(load(ISIN)) for ISIN in ISINs]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False)
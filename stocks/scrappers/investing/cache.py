@@ -0,0 +1,52 @@
+import os
+import pickle
+import time
+
+import config
+
+# part of the file names, bumped when the cached objects change shape so that older entries are misses
+version = 2
+
+def path(ISIN, name):
+    return os.path.join(config.cache_dir, "equities", ISIN, f"{name}.v{version}.pickle")
+
+def read(ISIN, name, ttl):
+    file_path = path(ISIN, name)
+    try:
+        age = time.time() - os.path.getmtime(file_path)
+    except OSError:
+        return None
+    # stale data is better than nothing when offline
+    if age > ttl and not config.offline:
+        return None
+    try:
+        with open(file_path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # unreadable, truncated or pickled from classes that changed since: a miss
+        return None
+
+def write(ISIN, name, value):
+    file_path = path(ISIN, name)
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, file_path)
+    except OSError:
+        pass
+
+def touch(ISIN, name):
+    # the cached value is known to be current, restart its ttl
+    try:
+        os.utime(path(ISIN, name))
+    except OSError:
+        pass
+
+def clear(ISIN):
+    dir_path = os.path.dirname(path(ISIN, ""))
+    if not os.path.isdir(dir_path):
+        return
+    for file_name in os.listdir(dir_path):
+        os.remove(os.path.join(dir_path, file_name))
@@ -1,18 +1,10 @@
-class CashFlow:
+from .statement import Statement
 
-    def __init__(self, data):
-        self.data = data
-
-    def __str__(self):
-        return self.data.to_string()
-
-    def __extract(self, label):
-        if not label in self.data.index:
-            return None
-        return self.data.loc[label]
+class CashFlow(Statement):
+    __slots__ = ()
 
     def depreciation(self):
-        return self.__extract("Depreciation/Depletion")
+        return self.row("Depreciation/Depletion")
     
     def capital_expenditures(self):
-        return self.__extract("Capital Expenditures")
\ No newline at end of file
+        return self.row("Capital Expenditures")
\ No newline at end of file
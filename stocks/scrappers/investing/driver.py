@@ -0,0 +1,75 @@
+import atexit
+
+import config
+
+# browser features a scraper has no use for
+lean_arguments = [
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+    "--autoplay-policy=user-gesture-required",
+    "--disable-gpu",
+    "--disable-notifications",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,InterestFeedContentSuggestions",
+]
+
+class Driver:
+
+    def __init__(self):
+        self.__driver = None
+
+    def __getattr__(self, name):
+        # any webdriver call (get, find_element...) starts the browser on first use
+        return getattr(self.instance(), name)
+
+    def __create(self):
+        # selenium is only imported once we actually need a browser
+        from selenium import webdriver
+
+        options = webdriver.ChromeOptions()
+        options.add_argument("headless")
+        options.add_argument("disable-extensions")
+        options.add_argument("--log-level=3")
+        if config.lean_browser:
+            # only the html and the scripts rendering the tables are needed
+            options.page_load_strategy = "eager"
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.notifications": 2,
+                "profile.managed_default_content_settings.geolocation": 2,
+            })
+            for argument in lean_arguments:
+                options.add_argument(argument)
+        instance = webdriver.Chrome(options=options)
+        # a page that never finishes loading is retried instead of blocking the browser
+        instance.set_page_load_timeout(config.page_load_timeout)
+        if config.measure_loads:
+            # the bytes of every resource of a page are counted, ad heavy pages have more than the default 250
+            instance.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": "performance.setResourceTimingBufferSize(100000);"})
+        if config.lean_browser and config.blocked_urls:
+            instance.execute_cdp_cmd("Network.enable", {})
+            instance.execute_cdp_cmd("Network.setBlockedURLs", {"urls": config.blocked_urls})
+        return instance
+
+    def instance(self):
+        if self.__driver is None:
+            self.__driver = self.__create()
+        return self.__driver
+
+    def started(self):
+        return self.__driver is not None
+
+    def quit(self):
+        if self.__driver is None:
+            return
+        try:
+            self.__driver.quit()
+        finally:
+            self.__driver = None
+
+driver = Driver()
+atexit.register(driver.quit)
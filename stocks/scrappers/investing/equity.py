@@ -1,162 +1,269 @@
-import pandas as pd
-import time
-import datetime
-import numpy as np
-import os
-import re
-
-from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver import ActionChains
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit
 
+import config
+from utils import trace
+from . import cache
+from . import history
+from . import index
+from . import fetchers
 from .income_statement import IncomeStatement
 from .balance_sheet import BalanceSheet
 from .cash_flow import CashFlow
 from .ratios import Ratios
 
-options = webdriver.ChromeOptions()
-options.add_argument("headless")
-options.add_argument("disable-extensions")
-options.add_argument("--log-level=3")
-driver = webdriver.Chrome(options=options)
+def parse(html):
+    # lxml and numpy are only loaded once a page has to be parsed
+    from . import extract
 
-def click_annual():
-    annual_btn = driver.find_element_by_link_text("Annual")
-    driver.execute_script("arguments[0].click();", annual_btn)
-    time.sleep(0.33)
+    with trace.span("parse"):
+        return extract.document(html)
+
+def read_quote(document):
+    from . import extract
+
+    return extract.quote(document)
+
+def read_statement(document):
+    # pandas is only loaded once a page has to be parsed
+    from . import extract
+    from . import normalize
+
+    with trace.span("extract"):
+        table = extract.statement(document)
+    with trace.span("normalize"):
+        return normalize.statement(*table)
+
+def read_latest_period(document):
+    from . import extract
+    from . import normalize
+
+    header = extract.latest_period(document)
+    return None if header is None else normalize.period(header)
+
+def read_ratios(document):
+    from . import extract
+    from . import normalize
+
+    with trace.span("extract"):
+        table = extract.ratios(document)
+    with trace.span("normalize"):
+        return normalize.ratios(*table)
+
+statements = ("income_statement", "balance_sheet", "cash_flow", "ratios")
 
 class Equity:
     url = None
 
-    def __init__(self, ISIN):
+    def __init__(self, ISIN, fetcher=None):
         ISIN = ISIN.upper()
-        dir_path = os.path.dirname(os.path.realpath(__file__))
-        csv_path = f"{dir_path}/equities/{ISIN[0:2]}.csv"
-        if not os.path.exists(csv_path):
-            raise Exception("Equities in this country are not supported yet")
-        equities = pd.read_csv(csv_path)
-        for index, equity in equities.iterrows():
-            if equity.ISIN == ISIN:
-                self.url = equity.Url
-                break
-        if not self.url:
+        # ISIN, symbol or investing.com PID
+        equity = index.find(ISIN)
+        if equity is None:
+            if len(ISIN) == 12 and not index.load().supports(ISIN[0:2]):
+                raise Exception("Equities in this country are not supported yet")
             raise Exception("ISIN not found")
+        self.ISIN = equity["ISIN"]
+        self.url = equity["Url"]
+        self.country = equity["Country"]
+        self.fetcher = fetchers.default() if fetcher is None else fetcher
+
+        # pages are only fetched once a statement is first accessed
+        self.__statements = {}
+        self.__quote = None
+        self.fetched = Counter()
+        self.cache_hits = Counter()
+
+    @property
+    def income_statement(self):
+        return self.__statement("income_statement", IncomeStatement, self.__income_statement)
+
+    @property
+    def balance_sheet(self):
+        return self.__statement("balance_sheet", BalanceSheet, self.__balance_sheet)
+
+    @property
+    def cash_flow(self):
+        return self.__statement("cash_flow", CashFlow, self.__cash_flow)
+
+    @property
+    def ratios(self):
+        return self.__statement("ratios", Ratios, self.__ratios)
+
+    @property
+    def name(self):
+        return self.__load_quote()[0]
+
+    @property
+    def price(self):
+        return self.__load_quote()[1]
+
+    def load(self):
+        # eagerly fetch everything, e.g. to fill the cache
+        self.income_statement
+        self.balance_sheet
+        self.cash_flow
+        self.ratios
+        self.__load_quote()
+        return self
+
+    async def load_async(self, names=statements, semaphore=None, executor=None):
+        # fetchers block, each page is fetched and parsed in its own thread
+        import asyncio
+        import contextlib
+
+        loop = asyncio.get_running_loop()
+        semaphore = contextlib.nullcontext() if semaphore is None else semaphore
+
+        async def load(function):
+            async with semaphore:
+                await loop.run_in_executor(executor, function)
 
-        self.income_statement = self.__income_statement()
-        self.balance_sheet = self.__balance_sheet()
-        self.cash_flow = self.__cash_flow()
-        self.ratios = self.__ratios()
-
-    def __income_statement(self):
-        driver.get(f"{self.url}-income-statement")
-
-        # get name
-        self.name = driver.find_elements_by_xpath("//section[@id='leftColumn']/div[@class='instrumentHead']/h1")[0].text
-        # get price
-        self.price = float(driver.find_element_by_id("last_last").text)
-
-        click_annual()
-
-        html = driver.page_source
-        soup = BeautifulSoup(html, "html.parser")
-        div = soup.select_one("div#rrtable")
-        table = pd.read_html(str(div))[0]
-        # rename colums
-        for i in range(1, len(table.columns)):
-            column_name = table.columns[i]
-            if column_name.startswith("Unnamed"):
-                table = table.drop(columns=[column_name])
-            else:
-                table = table.rename(columns={column_name: datetime.datetime.strptime(column_name, "%Y%d/%m").strftime("%d/%m/%Y")})
-        # use first column values as index
-        table.index = table.iloc[:, 0]
-        table.index.name = ""
-        # remove first column
-        table = table.drop(columns=["Period Ending:"])
-        # set non numeric values to NaN
-        table = table.apply(pd.to_numeric, errors="coerce")
-        # drop rows when all cells are set to NaN
-        table = table.dropna(how="all")
-        # values are actually in millions
-        table *= 1e6
-        return IncomeStatement(table)
+        def statement(name):
+            return lambda: getattr(self, name)
+
+        async def quote():
+            # wait for the income statement when the quote comes with it
+            if self.fetcher.quote_in_statements and "income_statement" in names:
+                await income_statement
+            await load(self.__load_quote)
+
+        tasks = {name: asyncio.ensure_future(load(statement(name))) for name in names}
+        income_statement = tasks.get("income_statement")
+        try:
+            await asyncio.gather(quote(), *tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        return self
+
+    def refresh(self):
+        # cheap update for nightly runs: only the header of the annual income statement is read
+        # to tell whether a new fiscal year was published, returns what had to be done:
+        # "parsed" (nothing cached), "reparsed" (new fiscal year), "refreshed" (new price) or "skipped"
+        cached = self.__cache_read("income_statement", float("inf"))
+        if cached is None:
+            self.load()
+            return "parsed"
+
+        self.__check_online("income_statement")
+        document = self.__fetch("income-statement", annual=True)
+        if read_latest_period(document) != IncomeStatement(cached).columns[0]:
+            cache.clear(self.ISIN)
+            table = self.__income_statement(document)
+            self.__cache_write("income_statement", table)
+            self.__record("income_statement", table)
+            self.__statements["income_statement"] = IncomeStatement(table)
+            self.load()
+            return "reparsed"
+
+        # the income statement is still current, the other statements expire with their ttl
+        cache.touch(self.ISIN, "income_statement")
+        previous = self.__cache_read("quote", float("inf"))
+        self.__quote = self.__read_quote(document) if self.fetcher.quote_in_statements else None
+        if self.__quote is None:
+            self.__quote = self.__read_quote(self.__fetch("quote"))
+        if self.__quote is None:
+            raise Exception(f"Price of {self.ISIN} not found")
+        if previous is not None and previous[1] == self.__quote[1]:
+            return "skipped"
+        # trailing ratios such as price to sales move with the price
+        table = self.__ratios()
+        self.__cache_write("ratios", table)
+        self.__statements["ratios"] = Ratios(table)
+        return "refreshed"
+
+    def __statement(self, name, statement_type, scrape):
+        if name not in self.__statements:
+            with trace.span(f"load.{name}", ISIN=self.ISIN):
+                self.__statements[name] = statement_type(self.__load(name, scrape))
+        return self.__statements[name]
+
+    def __load_quote(self):
+        if self.__quote is None:
+            self.__quote = self.__cache_read("quote", config.price_ttl)
+        # the quote is read along with the income statement, which is nearly always needed
+        if self.__quote is None and self.fetcher.quote_in_statements and "income_statement" not in self.__statements:
+            self.income_statement
+        if self.__quote is None:
+            self.__check_online("quote")
+            with trace.span("load.quote", ISIN=self.ISIN):
+                self.__quote = self.__read_quote(self.__fetch("quote"))
+            if self.__quote is None:
+                raise Exception(f"Price of {self.ISIN} not found")
+        return self.__quote
+
+    def __check_online(self, name):
+        if config.offline and self.fetcher.network:
+            raise Exception(f"No cached {name.replace('_', ' ')} for {self.ISIN}, it can't be downloaded offline")
+
+    def __cache_read(self, name, ttl):
+        if not self.fetcher.cacheable:
+            return None
+        with trace.span("cache.read"):
+            value = cache.read(self.ISIN, name, ttl)
+        if value is not None:
+            self.cache_hits[name] += 1
+        return value
+
+    def __cache_write(self, name, value):
+        if self.fetcher.cacheable:
+            cache.write(self.ISIN, name, value)
+
+    def __record(self, name, table):
+        # replayed pages were scraped some other time, fetchers kept out of the cache are benchmarks or tests
+        if config.history and self.fetcher.network and self.fetcher.cacheable and name in history.statements:
+            with trace.span("history.append"):
+                history.append(self.ISIN, self.country, name, table)
+
+    def __load(self, name, scrape):
+        table = self.__cache_read(name, config.statements_ttl)
+        if table is None:
+            self.__check_online(name)
+            table = scrape()
+            self.__cache_write(name, table)
+            self.__record(name, table)
+        return table
+
+    def __fetch(self, page, annual=False):
+        url = self.url
+        if page != "quote":
+            # some urls carry a query string, e.g. ?cid=7006
+            parts = urlsplit(self.url)
+            url = urlunsplit(parts._replace(path=f"{parts.path}-{page}"))
+        self.fetched[page] += 1
+        with trace.span("fetch", page=page):
+            html = self.fetcher.fetch(self.ISIN, page, url, annual)
+        return parse(html)
+
+    def __read_quote(self, document):
+        quote = read_quote(document)
+        if quote is not None:
+            self.__cache_write("quote", quote)
+        return quote
+
+    def __income_statement(self, document=None):
+        if document is None:
+            document = self.__fetch("income-statement", annual=True)
+
+        self.__quote = self.__read_quote(document) or self.__quote
+
+        return read_statement(document)
 
     def __balance_sheet(self):
-        driver.get(f"{self.url}-balance-sheet")
-
-        click_annual()
-
-        html = driver.page_source
-        soup = BeautifulSoup(html, "html.parser")
-        div = soup.select_one("div#rrtable")
-        table = pd.read_html(str(div))[0]
-        # rename colums
-        for i in range(1, len(table.columns)):
-            column_name = table.columns[i]
-            if column_name.startswith("Unnamed"):
-                table = table.drop(columns=[column_name])
-            else:
-                table = table.rename(columns={column_name: datetime.datetime.strptime(column_name, "%Y%d/%m").strftime("%d/%m/%Y")})
-        # use first column values as index
-        table.index = table.iloc[:, 0]
-        table.index.name = ""
-        # remove first column
-        table = table.drop(columns=["Period Ending:"])
-        # set non numeric values to NaN
-        table = table.apply(pd.to_numeric, errors="coerce")
-        # drop rows when all cells are set to NaN
-        table = table.dropna(how="all")
-        # values are actually in millions
-        table *= 1e6
-        return BalanceSheet(table)
+        document = self.__fetch("balance-sheet", annual=True)
+
+        return read_statement(document)
 
     def __cash_flow(self):
-        driver.get(f"{self.url}-cash-flow")
-
-        click_annual()
-
-        html = driver.page_source
-        soup = BeautifulSoup(html, "html.parser")
-        div = soup.select_one("div#rrtable")
-        table = pd.read_html(str(div))[0]
-        # rename colums
-        for i in range(1, len(table.columns)):
-            column_name = table.columns[i][0]
-            if column_name.startswith("Unnamed"):
-                table = table.drop(columns=[column_name])
-            else:
-                table = table.rename(columns={column_name: datetime.datetime.strptime(column_name, "%Y%d/%m").strftime("%d/%m/%Y")})
-        # use first column values as index
-        table.index = table.iloc[:, 0]
-        table.index.name = ""
-        # remove first column
-        table = table.drop(columns=["Period Ending:"])
-        # set non numeric values to NaN
-        table = table.apply(pd.to_numeric, errors="coerce")
-        # drop rows when all cells are set to NaN
-        table = table.dropna(how="all")
-        # values are actually in millions
-        table *= 1e6
-        return CashFlow(table)
+        document = self.__fetch("cash-flow", annual=True)
+
+        return read_statement(document)
 
     def __ratios(self):
-        driver.get(f"{self.url}-ratios")
-        html = driver.page_source
-        soup = BeautifulSoup(html, "html.parser")
-        div = soup.select_one("table#rrTable")
-        table = pd.read_html(str(div))[0]
-        # use first column values as index
-        table.index = table.iloc[:, 0]
-        table.index.name = ""
-        # remove first column
-        table = table.drop(columns=["Name"])
-        # drop rows when all cells are set to NaN
-        table = table.dropna(how="all")
-        return Ratios(table)
+        document = self.__fetch("ratios")
+
+        return read_ratios(document)
 
     def market_cap(self):
         return self.balance_sheet.total_common_shares_outstanding()[0] * self.price
@@ -0,0 +1,110 @@
+import lxml.html
+import numpy as np
+
+# cells that can't be read as a number (e.g. "-", "12 Months") are set to NaN
+def to_float(text):
+    try:
+        return float(text.replace(",", "").rstrip("%"))
+    except ValueError:
+        return np.nan
+
+class Cells:
+    # what the browser sends back instead of the page source: the name, the price and the text of the table cells,
+    # read by the functions below like a parsed page
+    def __init__(self, name, price, headers, labels, cells):
+        self.name = name
+        self.price = price
+        # None when the page has no table
+        self.headers = headers
+        self.labels = labels
+        self.cells = cells
+
+    def table(self):
+        if self.headers is None:
+            return None
+        return self.labels, self.headers, matrix([[to_float(text) for text in row] for row in self.cells], len(self.headers))
+
+def document(html):
+    # tables extracted in the browser need no parsing
+    if isinstance(html, Cells):
+        return html
+    return lxml.html.document_fromstring(html)
+
+def quote(document):
+    if isinstance(document, Cells):
+        if not document.name or not document.price:
+            return None
+        return document.name, to_float(document.price)
+    # get name
+    name = document.xpath("//section[@id='leftColumn']/div[contains(concat(' ', @class, ' '), ' instrumentHead ')]/h1")
+    # get price
+    price = document.xpath("//*[@id='last_last']")
+    # pages fetched without a browser only hold the table
+    if not name or not price:
+        return None
+    return name[0].text_content().strip(), to_float(price[0].text_content().strip())
+
+def rows(table):
+    # expandable sub items are rendered as nested tables, their rows are part of the statement
+    return table.iter("tr")
+
+def table(element):
+    labels = []
+    headers = None
+    values = []
+    for row in rows(element):
+        cells = [cell for cell in row if cell.tag in ("th", "td")]
+        # rows spanning the whole table only wrap the nested sub items
+        if not cells or any(cell.get("colspan") for cell in cells):
+            continue
+        # the first row made of headers only holds the period of each column
+        if all(cell.tag == "th" for cell in cells):
+            if headers is None:
+                headers = [cell.text_content().strip() for cell in cells[1:]]
+            continue
+        labels.append(cells[0].text_content().strip())
+        values.append([to_float(cell.text_content().strip()) for cell in cells[1:]])
+
+    if headers is None:
+        headers = []
+    return labels, headers, matrix(values, len(headers))
+
+def matrix(values, width):
+    # rows longer than the header are cut, shorter ones padded with NaN
+    result = np.full((len(values), width), np.nan)
+    for i, row in enumerate(values):
+        row = row[:width]
+        result[i, :len(row)] = row
+    return result
+
+def statement(document):
+    if isinstance(document, Cells):
+        result = document.table()
+        if result is None:
+            raise Exception("Financial table not found")
+        return result
+    # annual and quarterly statements are rendered in div#rrtable
+    element = document.xpath("//div[@id='rrtable']//table")
+    if not element:
+        raise Exception("Financial table not found")
+    return table(element[0])
+
+def latest_period(document):
+    if isinstance(document, Cells):
+        return document.headers[0] if document.headers else None
+    # header of the most recent annual column, the table itself isn't read
+    header = document.xpath("(//div[@id='rrtable']//table//tr[th and not(td)])[1]/th[2]")
+    if not header:
+        return None
+    return header[0].text_content().strip()
+
+def ratios(document):
+    if isinstance(document, Cells):
+        result = document.table()
+        if result is None:
+            raise Exception("Ratios table not found")
+        return result
+    element = document.xpath("//table[@id='rrTable']")
+    if not element:
+        raise Exception("Ratios table not found")
+    return table(element[0])
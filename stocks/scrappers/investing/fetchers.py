@@ -0,0 +1,277 @@
+import gzip
+import os
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+import config
+from utils import stats
+from utils import trace
+from . import index
+from . import scheduler
+from .driver import driver
+
+def first_row(driver):
+    from selenium.webdriver.common.by import By
+
+    return driver.find_element(By.CSS_SELECTOR, "div#rrtable table tr").text
+
+def click_annual(timeout):
+    from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    def rendered_row(driver):
+        # the first row of the table, False while there is none or it is still being filled
+        try:
+            return first_row(driver) or False
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+
+    def wait(condition, what):
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=0.02).until(condition)
+        except TimeoutException:
+            # retried by the scheduler
+            raise TimeoutError(f"The {what} statement was not rendered within {timeout}s")
+
+    start = time.perf_counter()
+    periods = wait(rendered_row, "quarterly")
+
+    annual_btn = driver.find_element(By.LINK_TEXT, "Annual")
+    # the page may already show the annual statement, clicking again would not change the table
+    if {"toggled", "active"} & set((annual_btn.get_attribute("class") or "").split()):
+        return time.perf_counter() - start
+    driver.execute_script("arguments[0].click();", annual_btn)
+
+    def annual_rendered(driver):
+        # the quarterly table may be removed before the annual one is inserted,
+        # only a table showing other periods means the annual one is there
+        row = rendered_row(driver)
+        return bool(row) and row != periods
+
+    wait(annual_rendered, "annual")
+    return time.perf_counter() - start
+
+# css selector of the table read on each page, the quote page only has the name and price
+selectors = {
+    "income-statement": "div#rrtable table",
+    "balance-sheet": "div#rrtable table",
+    "cash-flow": "div#rrtable table",
+    "ratios": "table#rrTable",
+}
+
+# runs in the browser, keeps the same rows and cells as extract.table
+table_script = """
+const text = (element) => element ? element.textContent.trim() : null;
+const result = {
+    name: text(document.querySelector("section#leftColumn > div.instrumentHead > h1")),
+    price: text(document.getElementById("last_last")),
+    headers: null,
+    labels: [],
+    cells: [],
+};
+const table = arguments[0] ? document.querySelector(arguments[0]) : null;
+if (!table) {
+    return result;
+}
+for (const row of table.querySelectorAll("tr")) {
+    const cells = Array.from(row.children).filter((cell) => cell.tagName === "TH" || cell.tagName === "TD");
+    if (!cells.length || cells.some((cell) => cell.getAttribute("colspan"))) {
+        continue;
+    }
+    if (cells.every((cell) => cell.tagName === "TH")) {
+        if (result.headers === null) {
+            result.headers = cells.slice(1).map(text);
+        }
+        continue;
+    }
+    result.labels.push(text(cells[0]));
+    result.cells.push(cells.slice(1).map(text));
+}
+if (result.headers === null) {
+    result.headers = [];
+}
+return result;
+"""
+
+# bytes received for the page and its resources, cross-origin resources only count when their server allows it
+transferred_script = """
+const entries = performance.getEntriesByType("navigation").concat(performance.getEntriesByType("resource"));
+return entries.reduce((total, entry) => total + (entry.transferSize || 0), 0);
+"""
+
+def extract_in_browser(page):
+    # only the cells cross the webdriver protocol, not the whole page
+    from .extract import Cells
+
+    result = driver.execute_script(table_script, selectors.get(page))
+    return Cells(result["name"], result["price"], result["headers"], result["labels"], result["cells"])
+
+# there is a single browser, pages are loaded one at a time
+driver_lock = threading.Lock()
+
+# time spent waiting for the annual table, per page, by every browser fetcher of the process
+waits = defaultdict(list)
+
+def take_waits():
+    # the waits since the last call, e.g. those of the equity a worker just analysed
+    with driver_lock:
+        taken = dict(waits)
+        waits.clear()
+    return taken
+
+class SeleniumFetcher:
+    # scraped tables may be served from and stored to the statements cache
+    cacheable = True
+    network = True
+    # every page goes through the one browser, see driver_lock
+    concurrent = False
+    # statement pages also show the name and price
+    quote_in_statements = True
+
+    def __init__(self, priority=None, extract=None):
+        # (load time, bytes transferred) of each page when config.measure_loads is set
+        self.loads = defaultdict(list)
+        self.priority = config.priority if priority is None else priority
+        # return the cells of the table read in the browser instead of the page source
+        self.extract = config.extract_in_browser if extract is None else extract
+
+    def __load(self, page, url, annual):
+        from selenium.common.exceptions import TimeoutException
+
+        with driver_lock:
+            start = time.perf_counter()
+            try:
+                with trace.span("driver.get"):
+                    driver.get(url)
+            except TimeoutException:
+                raise TimeoutError(f"{url} was not loaded within {config.page_load_timeout}s")
+            if config.measure_loads:
+                self.loads[page].append((time.perf_counter() - start, driver.execute_script(transferred_script)))
+            if annual:
+                with trace.span("click_annual"):
+                    waits[page].append(click_annual(config.annual_timeout))
+            if self.extract:
+                with trace.span("extract_in_browser"):
+                    return extract_in_browser(page)
+            with trace.span("page_source"):
+                return driver.page_source
+
+    def fetch(self, ISIN, page, url, annual=False):
+        return scheduler.default().run(url, lambda: self.__load(page, url, annual), self.priority)
+
+    def load_summary(self):
+        return {page: {"time": stats.summary([load_time for load_time, _ in loads]), "bytes": stats.summary([size for _, size in loads])}
+            for page, loads in self.loads.items()}
+
+# report types of the investing.com endpoint switching a statement to its annual version
+report_types = {"income-statement": "INC", "balance-sheet": "BAL", "cash-flow": "CAS"}
+
+user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"
+
+class HttpFetcher:
+    # no browser: pages are downloaded over kept-alive connections
+    cacheable = True
+    network = True
+    concurrent = True
+    # annual statements come without the rest of the page
+    quote_in_statements = False
+
+    def __init__(self, origin=None, pool=None, priority=None):
+        # origin replaces https://www.investing.com, e.g. to use a local stand-in server
+        self.origin = origin
+        self.priority = config.priority if priority is None else priority
+        if pool is None:
+            # http.client and ssl are only loaded when this fetcher is used
+            from .pool import ConnectionPool
+
+            # one kept-alive connection for each page the scheduler lets through at once
+            pool = ConnectionPool(size=config.host_concurrency, headers={"User-Agent": user_agent})
+        self.pool = pool
+
+    def __url(self, url):
+        if self.origin is None:
+            return url
+        parts = urlsplit(url)
+        return self.origin.rstrip("/") + urlunsplit(("", "", parts.path, parts.query, ""))
+
+    def get(self, url, headers=None):
+        target = self.__url(url)
+
+        def request():
+            with trace.span("http.get"):
+                response = self.pool.get(target, headers)
+            if response.status != 200:
+                raise scheduler.HttpError(response.status, url, response.headers.get("Retry-After"))
+            return response.text()
+
+        return scheduler.default().run(target, request, self.priority)
+
+    def fetch(self, ISIN, page, url, annual=False):
+        if not annual:
+            return self.get(url)
+        # the annual table is what the Annual link loads in the browser
+        parts = urlsplit(url)
+        ajax_url = urlunsplit((parts.scheme, parts.netloc, "/instruments/Financials/changereporttypeajax", urlencode({
+            "action": "change_report_type",
+            "pair_ID": index.find(ISIN)["PID"],
+            "report_type": report_types[page],
+            "period_type": "Annual",
+        }), ""))
+        table = self.get(ajax_url, {"X-Requested-With": "XMLHttpRequest", "Referer": url})
+        return f"<html><body><div id=\"rrtable\">{table}</div></body></html>"
+
+def fixture_path(path, ISIN, page):
+    return os.path.join(path, ISIN, f"{page}.html.gz")
+
+class RecordingFetcher:
+    # always hits the network so that every page gets recorded
+    cacheable = False
+    network = True
+
+    def __init__(self, path, fetcher=None):
+        self.path = path
+        # pages are recorded as html
+        self.fetcher = SeleniumFetcher(extract=False) if fetcher is None else fetcher
+        self.concurrent = self.fetcher.concurrent
+        self.quote_in_statements = self.fetcher.quote_in_statements
+
+    def fetch(self, ISIN, page, url, annual=False):
+        html = self.fetcher.fetch(ISIN, page, url, annual)
+        file_path = fixture_path(self.path, ISIN, page)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with gzip.open(file_path, "wt", encoding="utf-8") as f:
+            f.write(html)
+        return html
+
+class ReplayFetcher:
+    # pages are always parsed again, which is the whole point of replaying them
+    cacheable = False
+    network = False
+    concurrent = True
+    quote_in_statements = True
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self, ISIN, page, url, annual=False):
+        file_path = fixture_path(self.path, ISIN, page)
+        if not os.path.exists(file_path):
+            raise Exception(f"No recorded {page} page for {ISIN}")
+        with gzip.open(file_path, "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def ISINs(self):
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(ISIN for ISIN in os.listdir(self.path) if os.path.isdir(os.path.join(self.path, ISIN)))
+
+def default():
+    if config.replay:
+        return ReplayFetcher(config.replay)
+    fetcher = HttpFetcher(config.origin) if config.fetcher == "http" else SeleniumFetcher(extract=config.extract_in_browser and not config.record)
+    if config.record:
+        return RecordingFetcher(config.record, fetcher)
+    return fetcher
@@ -0,0 +1,208 @@
+import hashlib
+import os
+import shutil
+import time
+
+import config
+
+# every statement row ever scraped, stored column by column so that a column can be memory-mapped alone:
+# history/<country>/<fiscal year>/<segment>/<column>.npy, a segment holds one statement of one equity for one year
+columns = ("ISIN", "statement", "label", "period", "value", "scraped_at")
+numeric = ("value", "scraped_at")
+statements = ("income_statement", "balance_sheet", "cash_flow")
+
+# compacted segments list the segments they replaced
+compacted = "c-"
+# a compaction lock older than this, in seconds, was left by a process that died
+stale_lock = 600
+
+def path(country, year=None):
+    parts = [config.cache_dir, "history", country.upper()]
+    if year is not None:
+        parts.append(str(year))
+    return os.path.join(*parts)
+
+def segments(partition):
+    try:
+        names = os.listdir(partition)
+    except OSError:
+        return []
+    # segments being written are hidden
+    return sorted(name for name in names if not name.startswith("."))
+
+def merged(partition, segment):
+    import numpy as np
+
+    try:
+        return list(np.load(os.path.join(partition, segment, "merged.npy")))
+    except FileNotFoundError:
+        # not a compacted segment, or merged again by another compaction
+        return []
+
+def live(partition):
+    # segments replaced by a compacted one are left behind until the compaction removes them, they are skipped
+    names = segments(partition)
+    replaced = set()
+    for name in names:
+        if name.startswith(compacted):
+            replaced.update(merged(partition, name))
+    return [name for name in names if name not in replaced]
+
+def exists(partition, name):
+    if os.path.isdir(os.path.join(partition, name)):
+        return True
+    return any(name in merged(partition, segment) for segment in segments(partition) if segment.startswith(compacted))
+
+def write_segment(partition, name, data, merged_names=()):
+    import numpy as np
+
+    tmp_path = os.path.join(partition, f".{name}.{os.getpid()}.tmp")
+    os.makedirs(tmp_path, exist_ok=True)
+    for column in columns:
+        np.save(os.path.join(tmp_path, f"{column}.npy"), data[column])
+    if merged_names:
+        np.save(os.path.join(tmp_path, "merged.npy"), np.array(sorted(merged_names)))
+    try:
+        os.rename(tmp_path, os.path.join(partition, name))
+    except OSError:
+        # written by another process in the meantime
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        return False
+    return True
+
+def append(ISIN, country, statement, table, scraped_at=None):
+    # segments are named after their content: scraping the same figures again writes nothing,
+    # restated figures are a new segment and the old ones are kept
+    import numpy as np
+
+    values, labels, periods = table
+    if not len(labels):
+        return 0
+    values = np.asarray(values, dtype=np.float64)
+    scraped_at = time.time() if scraped_at is None else scraped_at
+    written = 0
+    partitions = set()
+    for j, period in enumerate(periods):
+        column = np.ascontiguousarray(values[:, j])
+        digest = hashlib.sha1("\0".join([ISIN, statement, period] + list(labels)).encode("utf-8"))
+        digest.update(column.tobytes())
+        name = digest.hexdigest()
+        partition = path(country, period[-4:])
+        if exists(partition, name):
+            continue
+        size = len(labels)
+        data = {
+            "ISIN": np.full(size, ISIN),
+            "statement": np.full(size, statement),
+            "label": np.array(labels, dtype=str),
+            "period": np.full(size, period),
+            "value": column,
+            "scraped_at": np.full(size, scraped_at, dtype=np.float64),
+        }
+        if write_segment(partition, name, data):
+            written += 1
+            partitions.add(partition)
+    # a partition of many small segments is slow to read, it is merged as it grows
+    for partition in partitions:
+        if len(segments(partition)) > config.history_segments:
+            compact_partition(partition)
+    return written
+
+def compact_partition(partition):
+    # one segment instead of every live one, safe while the partition is read or appended to:
+    # readers skip the replaced segments and read again the ones removed under them,
+    # and a single process compacts a partition at a time
+    import numpy as np
+
+    lock = os.path.join(partition, ".compacting")
+    try:
+        os.mkdir(lock)
+    except FileExistsError:
+        try:
+            if time.time() - os.path.getmtime(lock) < stale_lock:
+                return 0
+        except OSError:
+            return 0
+        shutil.rmtree(lock, ignore_errors=True)
+        return compact_partition(partition)
+    except OSError:
+        return 0
+    try:
+        names = live(partition)
+        if len(names) < 2:
+            return 0
+        data = {column: np.concatenate([np.load(os.path.join(partition, name, f"{column}.npy")) for name in names]) for column in columns}
+        merged_names = set(names)
+        for name in names:
+            merged_names.update(merged(partition, name))
+        name = compacted + hashlib.sha1("\0".join(sorted(merged_names)).encode("utf-8")).hexdigest()
+        if not write_segment(partition, name, data, merged_names):
+            return 0
+        # including the segments a compaction that died replaced without removing them
+        for name in segments(partition):
+            if name in merged_names:
+                shutil.rmtree(os.path.join(partition, name), ignore_errors=True)
+        return len(names)
+    finally:
+        shutil.rmtree(lock, ignore_errors=True)
+
+def compact(country=None):
+    # every partition, or those of a country, down to one segment each
+    root = os.path.dirname(path("_"))
+    countries = [country.upper()] if country else segments(root)
+    return sum(compact_partition(path(country, year)) for country in countries for year in segments(path(country)))
+
+def read(country, labels=None, years=None, ISINs=None, statement=None, columns=columns, latest=True):
+    # only the columns filtered on or asked for are read, each one memory-mapped,
+    # years: (first, last) fiscal years, both included
+    import numpy as np
+    import pandas as pd
+
+    filters = {"label": labels, "ISIN": ISINs, "statement": statement}
+    filters = {column: [wanted] if isinstance(wanted, str) else list(wanted) for column, wanted in filters.items() if wanted is not None}
+    key = ["ISIN", "statement", "label", "period"]
+    needed = list(dict.fromkeys(list(columns) + (key + ["scraped_at"] if latest else [])))
+
+    def read_partition(partition):
+        chunks = {column: [] for column in needed}
+        for segment in live(partition):
+            segment_path = os.path.join(partition, segment)
+            loaded = {}
+
+            def load(column):
+                if column not in loaded:
+                    loaded[column] = np.load(os.path.join(segment_path, f"{column}.npy"), mmap_mode="r")
+                return loaded[column]
+
+            mask = None
+            for column, wanted in filters.items():
+                selected = np.isin(load(column), wanted)
+                mask = selected if mask is None else mask & selected
+            if mask is not None and not mask.any():
+                continue
+            for column in needed:
+                chunks[column].append(np.array(load(column) if mask is None else load(column)[mask]))
+        return chunks
+
+    chunks = {column: [] for column in needed}
+    for year in segments(path(country)):
+        if years is not None and not years[0] <= int(year) <= years[1]:
+            continue
+        partition = path(country, year)
+        while True:
+            try:
+                partition_chunks = read_partition(partition)
+                break
+            except FileNotFoundError:
+                # compacted while being read, its segments are listed again
+                continue
+        for column in needed:
+            chunks[column].extend(partition_chunks[column])
+
+    # nothing found: an empty frame with the types of the columns, so that the text columns can still be sliced
+    data = pd.DataFrame({column: np.concatenate(chunk) if chunk else np.array([], dtype=float if column in numeric else object)
+        for column, chunk in chunks.items()})
+    if latest and len(data):
+        # restated figures: the last scraped version wins
+        data = data.sort_values("scraped_at", kind="stable").drop_duplicates(key, keep="last")
+    return data[list(columns)].reset_index(drop=True)
@@ -1,55 +1,47 @@
 
-class IncomeStatement:
+from .statement import Statement
 
-    def __init__(self, data):
-        self.data = data
-
-    def __str__(self):
-        return self.data.to_string()
-
-    def __extract(self, label):
-        if not label in self.data.index:
-            return None
-        return self.data.loc[label]
+class IncomeStatement(Statement):
+    __slots__ = ()
 
     def column(self, index):
-        return self.data.columns[index]
+        return self.columns[index]
 
     def total_revenue(self):
-        return self.__extract("Total Revenue")
+        return self.row("Total Revenue")
     
     def gross_profit(self):
-        return self.__extract("Gross Profit")
+        return self.row("Gross Profit")
     
     def total_operating_expenses(self):
-        return self.__extract("Total Operating Expenses")
+        return self.row("Total Operating Expenses")
 
     def selling_general_administrative_expenses(self):
-        return self.__extract("Selling/General/Admin. Expenses, Total")
+        return self.row("Selling/General/Admin. Expenses, Total")
     
     def depreciation_amortization(self):
-        return self.__extract("Depreciation / Amortization")
+        return self.row("Depreciation / Amortization")
     
     def interest_expense(self):
-        return self.__extract("Interest Expense (Income) - Net Operating")
+        return self.row("Interest Expense (Income) - Net Operating")
 
     def interest_income(self):
-        return self.__extract("Interest Income (Expense), Net Non-Operating")
+        return self.row("Interest Income (Expense), Net Non-Operating")
 
     def operating_income(self):
-        return self.__extract("Operating Income")
+        return self.row("Operating Income")
 
     def net_income(self):
-        return self.__extract("Net Income")
+        return self.row("Net Income")
 
     def net_income_before_taxes(self):
-        return self.__extract("Net Income Before Taxes")
+        return self.row("Net Income Before Taxes")
     
     def provision_for_income_taxes(self):
-        return self.__extract("Provision for Income Taxes")
+        return self.row("Provision for Income Taxes")
 
     def net_income_after_taxes(self):
-        return self.__extract("Net Income After Taxes")
+        return self.row("Net Income After Taxes")
 
     def income_available_to_common_excluding_extraordinary_items(self):
-        return self.__extract("Income Available to Common Excluding Extraordinary Items")
\ No newline at end of file
+        return self.row("Income Available to Common Excluding Extraordinary Items")
\ No newline at end of file
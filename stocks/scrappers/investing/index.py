@@ -0,0 +1,94 @@
+import csv
+import os
+import pickle
+
+import config
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+equities_path = os.path.join(dir_path, "equities")
+index_path = os.path.join(config.cache_dir, "equities.pickle")
+
+# bump when the layout of the pickled index or the way it is built changes
+version = 2
+
+class EquityIndex:
+
+    def __init__(self, sources, countries, keys):
+        self.sources = sources
+        self.countries = countries
+        self.keys = keys
+
+    def find(self, key):
+        return self.keys.get(str(key).strip().upper())
+
+    def supports(self, country):
+        return country.upper() in self.countries
+
+def sources():
+    # the index is stale as soon as a country file is added, removed or modified
+    result = {}
+    for file_name in sorted(os.listdir(equities_path)):
+        if file_name.endswith(".csv"):
+            stat = os.stat(os.path.join(equities_path, file_name))
+            result[file_name] = (stat.st_mtime_ns, stat.st_size)
+    return result
+
+def build(current_sources):
+    countries = set()
+    keys = {}
+    symbols = {}
+    ambiguous = set()
+    for file_name in current_sources:
+        country = file_name[:-4].upper()
+        countries.add(country)
+        with open(os.path.join(equities_path, file_name), newline="") as f:
+            for row in csv.DictReader(f):
+                equity = dict(row, Country=country)
+                keys[equity["ISIN"].upper()] = equity
+                keys[equity["PID"]] = equity
+                # the same ticker can be listed in several countries
+                symbol = equity["Symbol"].upper()
+                if symbol in symbols and symbols[symbol]["ISIN"] != equity["ISIN"]:
+                    ambiguous.add(symbol)
+                symbols.setdefault(symbol, equity)
+    # tickers are only added once every ISIN and PID is known, which they never replace
+    for symbol, equity in symbols.items():
+        if symbol not in ambiguous:
+            keys.setdefault(symbol, equity)
+    return EquityIndex(current_sources, countries, keys)
+
+def save(index):
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((version, index.sources, index.countries, index.keys), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        # a read-only install still works, it just rebuilds the index on each run
+        pass
+
+def read(current_sources):
+    try:
+        with open(index_path, "rb") as f:
+            saved_version, saved_sources, countries, keys = pickle.load(f)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+    if saved_version != version or saved_sources != current_sources:
+        return None
+    return EquityIndex(saved_sources, countries, keys)
+
+_index = None
+
+def load():
+    global _index
+    if _index is None:
+        current_sources = sources()
+        _index = read(current_sources)
+        if _index is None:
+            _index = build(current_sources)
+            save(_index)
+    return _index
+
+def find(key):
+    return load().find(key)
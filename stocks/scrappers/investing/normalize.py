@@ -0,0 +1,33 @@
+import re
+
+import numpy as np
+
+# periods are rendered as "<year><day>/<month>", e.g. "202131/12"
+period_pattern = re.compile(r"^(\d{4})(\d{1,2})/(\d{1,2})$")
+
+def period(header):
+    match = period_pattern.match(header)
+    if match is None:
+        raise Exception(f"Unexpected period \"{header}\"")
+    year, day, month = match.groups()
+    return f"{int(day):02d}/{int(month):02d}/{year}"
+
+def table(labels, headers, values, periods=True, scale=1):
+    # columns without header are layout artifacts
+    columns = [i for i, header in enumerate(headers) if header]
+    headers = [period(headers[i]) if periods else headers[i] for i in columns]
+    # drop rows when all cells are NaN (titles, period length...)
+    rows = np.flatnonzero(~np.isnan(values[:, columns]).all(axis=1))
+    # a single copy holding only the kept cells, already scaled
+    data = values[np.ix_(rows, columns)]
+    if scale != 1:
+        data *= scale
+    # what the statements are built from, and cached as, no pandas involved
+    return data, [labels[i] for i in rows], headers
+
+def statement(labels, headers, values):
+    # values are actually in millions
+    return table(labels, headers, values, scale=1e6)
+
+def ratios(labels, headers, values):
+    return table(labels, headers, values, periods=False)
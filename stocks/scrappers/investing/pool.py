@@ -0,0 +1,112 @@
+import gzip
+import http.client
+import queue
+import threading
+import zlib
+from urllib.parse import urlsplit
+
+# network errors after which a kept-alive connection is thrown away and the request sent again
+stale_errors = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+class Response:
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def text(self):
+        charset = "utf-8"
+        content_type = self.headers.get("Content-Type", "")
+        if "charset=" in content_type:
+            charset = content_type.split("charset=")[-1].split(";")[0].strip()
+        return self.body.decode(charset, errors="replace")
+
+class ConnectionPool:
+
+    def __init__(self, size=4, timeout=30, headers=None):
+        self.size = size
+        self.timeout = timeout
+        self.headers = {} if headers is None else headers
+        self.__idle = {}
+        self.__lock = threading.Lock()
+
+    def __connections(self, origin):
+        with self.__lock:
+            if origin not in self.__idle:
+                self.__idle[origin] = queue.LifoQueue()
+            return self.__idle[origin]
+
+    def __connect(self, scheme, netloc):
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def __acquire(self, scheme, netloc):
+        try:
+            return self.__connections((scheme, netloc)).get_nowait(), True
+        except queue.Empty:
+            return self.__connect(scheme, netloc), False
+
+    def __release(self, scheme, netloc, connection):
+        idle = self.__connections((scheme, netloc))
+        # keep at most size idle connections per host
+        if idle.qsize() < self.size:
+            idle.put(connection)
+        else:
+            connection.close()
+
+    def request(self, method, url, headers=None):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        request_headers = dict(self.headers, **({} if headers is None else headers))
+        request_headers.setdefault("Accept-Encoding", "gzip, deflate")
+
+        connection, reused = self.__acquire(parts.scheme, parts.netloc)
+        try:
+            connection.request(method, path, headers=request_headers)
+            response = connection.getresponse()
+        except stale_errors:
+            connection.close()
+            if not reused:
+                raise
+            # the server closed the idle connection, retry on a fresh one
+            connection = self.__connect(parts.scheme, parts.netloc)
+            try:
+                connection.request(method, path, headers=request_headers)
+                response = connection.getresponse()
+            except Exception:
+                connection.close()
+                raise
+        except Exception:
+            connection.close()
+            raise
+
+        try:
+            body = response.read()
+        except Exception:
+            # a half read response leaves the connection unusable
+            connection.close()
+            raise
+        encoding = response.getheader("Content-Encoding", "")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+        if response.will_close:
+            connection.close()
+        else:
+            self.__release(parts.scheme, parts.netloc, connection)
+        return Response(response.status, response.headers, body)
+
+    def get(self, url, headers=None):
+        return self.request("GET", url, headers)
+
+    def close(self):
+        with self.__lock:
+            idle, self.__idle = self.__idle, {}
+        for connections in idle.values():
+            while not connections.empty():
+                connections.get_nowait().close()
@@ -1,16 +1,8 @@
 
-class Ratios:
+from .statement import Statement
 
-    def __init__(self, data):
-        self.data = data
-
-    def __str__(self):
-        return self.data.to_string()
-
-    def __extract(self, label):
-        if not label in self.data.index:
-            return None
-        return self.data.loc[label]
+class Ratios(Statement):
+    __slots__ = ()
 
     def price_to_sales_ttm(self):
-        return self.__extract("Price to Sales TTM")
+        return self.row("Price to Sales TTM")
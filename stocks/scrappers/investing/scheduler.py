@@ -0,0 +1,166 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import config
+from utils import trace
+
+# lower runs first: single company lookups go before bulk screens
+priorities = {"interactive": 0, "bulk": 1}
+
+class HttpError(Exception):
+
+    def __init__(self, status, url, retry_after=None):
+        super().__init__(f"HTTP {status} while fetching {url}")
+        self.status = status
+        # only the number of seconds form of Retry-After is understood
+        self.retry_after = float(retry_after) if retry_after and retry_after.strip().isdigit() else None
+
+def retryable(error):
+    import http.client
+
+    if isinstance(error, HttpError):
+        return error.status == 429 or error.status >= 500
+    # timeouts and dropped connections
+    return isinstance(error, (TimeoutError, ConnectionError, http.client.HTTPException))
+
+class TokenBucket:
+
+    def __init__(self, rate, burst=1):
+        # rate tokens per second, at most burst of them saved up
+        self.limit = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def __refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self):
+        # a token if one is available right now
+        self.__refill()
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def reserve(self):
+        # the next token, which may only be available later: returns how long to wait for it
+        self.__refill()
+        self.tokens -= 1
+        return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def slow_down(self):
+        # the host throttles us, halve the rate and get back to the limit slowly
+        self.rate = max(self.limit / 16, self.rate / 2)
+
+    def speed_up(self):
+        self.rate = min(self.limit, self.rate + self.limit / 16)
+
+class Host:
+
+    def __init__(self, bucket, concurrency):
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.active = 0
+        # (priority, ticket) of the requests waiting for a slot
+        self.waiting = []
+
+class Scheduler:
+
+    def __init__(self, rate_limits=None, concurrency=4, retries=4, backoff=0.5, max_backoff=30):
+        # rate_limits: host -> (requests per second, burst), hosts not listed are not rate limited
+        self.rate_limits = {} if rate_limits is None else rate_limits
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # requests, retries, throttled and failed requests
+        self.stats = Counter()
+        self.__hosts = {}
+        self.__condition = threading.Condition()
+        self.__tickets = itertools.count()
+
+    def __host(self, host):
+        if host not in self.__hosts:
+            bucket = None
+            if host in self.rate_limits:
+                bucket = TokenBucket(*self.rate_limits[host])
+            self.__hosts[host] = Host(bucket, self.concurrency)
+        return self.__hosts[host]
+
+    def __acquire(self, host, priority):
+        # requests get a slot by priority then first come first served, and reserve a token in that order
+        with trace.span("scheduler.wait"):
+            with self.__condition:
+                state = self.__host(host)
+                entry = (priority, next(self.__tickets))
+                heapq.heappush(state.waiting, entry)
+                self.__condition.wait_for(lambda: state.waiting[0] == entry and state.active < state.concurrency)
+                heapq.heappop(state.waiting)
+                state.active += 1
+                delay = 0 if state.bucket is None else state.bucket.reserve()
+                self.stats["requests"] += 1
+                self.__condition.notify_all()
+            time.sleep(delay)
+
+    def __release(self, host, error=None):
+        with self.__condition:
+            state = self.__host(host)
+            state.active -= 1
+            if isinstance(error, HttpError) and error.status == 429:
+                self.stats["throttled"] += 1
+                if state.bucket is not None:
+                    state.bucket.slow_down()
+            elif error is None and state.bucket is not None:
+                state.bucket.speed_up()
+            self.__condition.notify_all()
+
+    def delay(self, attempt, retry_after=None):
+        # exponential backoff with full jitter, so that failed requests don't come back all at once
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        return delay if retry_after is None else max(delay, retry_after)
+
+    def run(self, url, request, priority="interactive"):
+        # request() is attempted again after timeouts, dropped connections, 429 and 5xx responses
+        host = urlsplit(url).netloc
+        for attempt in itertools.count():
+            self.__acquire(host, priorities[priority])
+            try:
+                result = request()
+            except Exception as e:
+                self.__release(host, e)
+                if attempt >= self.retries or not retryable(e):
+                    with self.__condition:
+                        self.stats["failed"] += 1
+                    raise
+                delay = self.delay(attempt, getattr(e, "retry_after", None))
+            else:
+                self.__release(host)
+                return result
+            with self.__condition:
+                self.stats["retries"] += 1
+            with trace.span("scheduler.backoff"):
+                time.sleep(delay)
+
+def share(rate_limits, workers):
+    # each worker process has its own scheduler, they split the rate limits between them
+    return {host: (rate / workers, max(1, burst // workers)) for host, (rate, burst) in rate_limits.items()}
+
+_default = None
+_lock = threading.Lock()
+
+def default():
+    # one scheduler per process, shared by every fetcher: rate limits and priorities don't reach other processes
+    global _default
+    with _lock:
+        if _default is None:
+            _default = Scheduler(config.rate_limits, config.host_concurrency, config.retries, config.backoff, config.max_backoff)
+        return _default
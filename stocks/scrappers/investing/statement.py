@@ -0,0 +1,34 @@
+class Statement:
+    # a contiguous float64 matrix, one row per label and the most recent period first,
+    # rows are returned as read-only views of it
+    __slots__ = ("values", "labels", "columns", "rows", "__data")
+
+    def __init__(self, table):
+        import numpy as np
+
+        values, labels, columns = table
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.values.flags.writeable = False
+        self.labels = labels
+        self.columns = columns
+        # the first row wins when a label is repeated
+        self.rows = {}
+        for i, label in enumerate(labels):
+            self.rows.setdefault(label, i)
+        self.__data = None
+
+    def __str__(self):
+        return self.data.to_string()
+
+    @property
+    def data(self):
+        # pandas view, only built when asked for
+        if self.__data is None:
+            import pandas as pd
+
+            self.__data = pd.DataFrame(self.values, index=self.labels, columns=self.columns, copy=False)
+        return self.__data
+
+    def row(self, label):
+        i = self.rows.get(label)
+        return None if i is None else self.values[i]
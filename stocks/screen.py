@@ -0,0 +1,195 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+
+import config
+from utils import trace
+from utils.translate import translator
+import scrappers.investing as inv
+from scrappers.investing import index
+from scrappers.investing import scheduler
+
+pickers = ["Buffet", "Mayer", "Slater"]
+
+def init_worker(settings):
+    # workers may be spawned, they don't inherit the parent's configuration
+    for key, value in settings.items():
+        setattr(config, key, value)
+
+    # each worker owns one long-lived browser, closed when the pool shuts down
+    from multiprocessing.util import Finalize
+    from scrappers.investing.driver import driver
+    Finalize(driver, driver.quit, exitpriority=10)
+
+    # spans are left next to the trace when the worker exits, the parent merges them
+    if trace.enable():
+        # forked workers start with a copy of the parent's spans
+        trace.events.clear()
+        Finalize(None, trace.save_part, exitpriority=10)
+
+def usage(equity):
+    # what the worker did for the equity it just analysed, added up by run()
+    from scrappers.investing import fetchers
+
+    return {
+        "waits": fetchers.take_waits(),
+        "fetched": Counter() if equity is None else equity.fetched,
+        "cache_hits": Counter() if equity is None else equity.cache_hits,
+    }
+
+def screen(ISIN, with_fundamentals=False):
+    import report
+
+    start = time.perf_counter()
+    equity = None
+    try:
+        with trace.span("screen", ISIN=ISIN):
+            equity = inv.Equity(ISIN)
+            analysis = report.analyse(equity, pickers, with_fundamentals)
+    except Exception as e:
+        # a single equity must not stop the whole screen
+        analysis = report.Analysis(ISIN, error=f"{type(e).__name__}: {e}")
+    return analysis, time.perf_counter() - start, usage(equity)
+
+def universe(targets):
+    ISINs = []
+    for target in targets:
+        if os.path.isfile(target):
+            # one ISIN per line, or a csv file with an ISIN column
+            with open(target) as f:
+                lines = [line.strip() for line in f if line.strip()]
+            if lines and "ISIN" in lines[0].split(","):
+                column = lines[0].split(",").index("ISIN")
+                lines = [line.split(",")[column] for line in lines[1:]]
+            ISINs.extend(lines)
+        elif len(target) == 2 and index.load().supports(target):
+            ISINs.extend(key for key, equity in index.load().keys.items() if key == equity["ISIN"] and equity["Country"] == target.upper())
+        else:
+            ISINs.append(target.upper())
+    # keep the order, drop duplicates
+    return list(dict.fromkeys(ISINs))
+
+def average(analysis):
+    values = [result.score for result in analysis.pickers.values() if result.score is not None]
+    return sum(values) / len(values) if values else None
+
+def ranking(analyses, tr):
+    from tabulate import tabulate
+
+    def rank(analysis):
+        score = average(analysis)
+        return -1 if score is None else score
+
+    table = []
+    for position, analysis in enumerate(sorted(analyses, key=rank, reverse=True), 1):
+        row = [position, analysis.ISIN, analysis.name] + [analysis.pickers[picker].score for picker in pickers] + [average(analysis)]
+        table.append(row)
+    return tabulate(table, headers=["#", "ISIN", tr("Name")] + pickers + [tr("Score")], floatfmt=".2f")
+
+def worker_settings(workers, **settings):
+    # the workers split the rate limits of each host between them, other commands run at the same time aren't accounted for
+    return dict(settings, rate_limits=scheduler.share(config.rate_limits, max(1, workers)), priority="bulk", trace=config.trace)
+
+def counts(counter):
+    if not counter:
+        return "0"
+    return "{} ({})".format(sum(counter.values()), ", ".join("{} {}".format(name, count) for name, count in sorted(counter.items())))
+
+def print_waits(waits):
+    from utils import stats
+
+    if not waits:
+        return
+    print("\nWaits for the annual table:", file=sys.stderr)
+    for page, values in sorted(waits.items()):
+        summary = stats.summary(values)
+        print("{}: {} pages, p50 {:.2f}s, p95 {:.2f}s, max {:.2f}s".format(page, summary["count"], summary["p50"], summary["p95"], summary["max"]), file=sys.stderr)
+
+def run(task, ISINs, workers, settings, stream, tr, seen=None):
+    # task(ISIN) returns the analysis first and its usage() last, seen is called with everything it returned,
+    # analyses are streamed as they complete or ranked once done, returns the elapsed time
+    results = []
+    failures = []
+    waits = defaultdict(list)
+    fetched = Counter()
+    cache_hits = Counter()
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(max(1, workers), initializer=init_worker, initargs=(settings,))
+    try:
+        for i, result in enumerate(pool.imap_unordered(task, ISINs), 1):
+            analysis = result[0]
+            for page, values in result[-1]["waits"].items():
+                waits[page].extend(values)
+            fetched.update(result[-1]["fetched"])
+            cache_hits.update(result[-1]["cache_hits"])
+            if seen is not None:
+                seen(result)
+            if stream is not None:
+                stream.write(analysis)
+            elif analysis.error:
+                failures.append((analysis.ISIN, analysis.error))
+            else:
+                results.append(analysis)
+            print("\r[{}/{}] {}".format(i, len(ISINs), analysis.ISIN), end="", file=sys.stderr, flush=True)
+        pool.close()
+    except KeyboardInterrupt:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    if stream is None:
+        print(ranking(results, tr))
+
+    if failures:
+        print("\n" + tr("Failed") + ":")
+        for ISIN, error in failures:
+            print("{}: {}".format(ISIN, error))
+
+    print("\npages fetched: {}".format(counts(fetched)), file=sys.stderr)
+    print("served from the cache: {}".format(counts(cache_hits)), file=sys.stderr)
+    print_waits(waits)
+    return elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Screen many companies with every picker and rank them")
+    parser.add_argument("targets", nargs="+", help="Country codes (e.g. FR), files of ISINs or ISINs")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Number of worker processes, each with its own browser")
+    parser.add_argument("-n", "--limit", type=int, default=None, help="Only screen the first N equities")
+    parser.add_argument("-l", "--language", default="en", help="Language")
+    parser.add_argument("-o", "--offline", action="store_true", help="Only use cached data, never download anything")
+    parser.add_argument("-f", "--fetcher", choices=["selenium", "http"], default="selenium", help="Download pages with chrome or without a browser")
+    parser.add_argument("--origin", metavar="URL", help="Fetch pages from this server instead of investing.com with the http fetcher")
+    parser.add_argument("--record", metavar="DIR", help="Save the scraped pages under this folder")
+    parser.add_argument("--replay", metavar="DIR", help="Analyse pages previously saved with --record instead of scraping them")
+    parser.add_argument("--trace", metavar="FILE", help="Time each stage in every worker and write a chrome trace to this file")
+    parser.add_argument("--format", choices=["table", "text", "json", "csv"], default="table",
+        help="Rank the companies in a table once done, or stream each analysis as text, JSON lines or CSV rows as it completes")
+    args = parser.parse_args()
+
+    import functools
+    import report
+
+    tr = translator(args.language)
+    trace.enable(args.trace)
+    settings = worker_settings(args.workers, language=args.language, offline=args.offline, fetcher=args.fetcher, origin=args.origin,
+        record=args.record, replay=args.replay)
+
+    ISINs = universe(args.targets)[:args.limit]
+    if not ISINs:
+        parser.error("no equity to screen")
+
+    # the text report includes the fundamentals, the other formats only the pickers
+    with_fundamentals = args.format == "text"
+    stream = None if args.format == "table" else report.writer(args.format, sys.stdout, tr, with_fundamentals=with_fundamentals)
+    elapsed = run(functools.partial(screen, with_fundamentals=with_fundamentals), ISINs, args.workers, settings, stream, tr)
+
+    print("\n{} equities in {:.1f}s ({:.2f} equities/s, {} workers)".format(
+        len(ISINs), elapsed, len(ISINs) / elapsed, args.workers), file=sys.stderr)
+
+    trace.save(sys.stderr)
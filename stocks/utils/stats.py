@@ -0,0 +1,17 @@
+import math
+
+def percentile(sorted_values, p):
+    # nearest rank, values must be sorted
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summary(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "max": values[-1] if values else None,
+    }
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+import config
+from utils import stats
+
+# spans around each stage of an analysis, off unless config.trace or the STOCKS_TRACE environment variable
+# names a file: a disabled span costs a function call and returns a shared do-nothing context manager
+
+# (name, start, duration in ns, pid, thread id, args)
+events = []
+enabled = False
+
+class NullSpan:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+null_span = NullSpan()
+
+class Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        # list.append is atomic, spans of concurrent threads need no lock
+        events.append((self.name, self.start, time.perf_counter_ns() - self.start, os.getpid(), threading.get_native_id(), self.args))
+        return False
+
+def span(name, **args):
+    if not enabled:
+        return null_span
+    return Span(name, args)
+
+def enable(path=None):
+    global enabled
+    config.trace = path or config.trace or os.environ.get("STOCKS_TRACE")
+    enabled = bool(config.trace)
+    return enabled
+
+def part_path(path, pid):
+    return f"{path}.{pid}.part"
+
+def save_part():
+    # worker processes leave their spans next to the trace, the parent merges them
+    import json
+
+    if not enabled or not events:
+        return
+    with open(part_path(config.trace, os.getpid()), "w") as f:
+        json.dump(events, f)
+
+def collect(path):
+    import glob
+    import json
+
+    merged = list(events)
+    for file_path in glob.glob(part_path(glob.escape(path), "*")):
+        try:
+            with open(file_path) as f:
+                merged.extend(tuple(event) for event in json.load(f))
+            os.remove(file_path)
+        except (OSError, ValueError):
+            pass
+    return merged
+
+def aggregates(spans):
+    # name -> count, p50, p95, max and total duration in seconds
+    durations = {}
+    for name, start, duration, pid, tid, args in spans:
+        durations.setdefault(name, []).append(duration / 1e9)
+    return {name: dict(stats.summary(values), total=sum(values)) for name, values in sorted(durations.items())}
+
+def chrome(spans):
+    # trace event format, complete events in microseconds
+    trace_events = [{"name": name, "ph": "X", "ts": start / 1e3, "dur": duration / 1e3, "pid": pid, "tid": tid, "args": args}
+        for name, start, duration, pid, tid, args in spans]
+    for pid in sorted({event[3] for event in spans}):
+        name = "main" if pid == os.getpid() else "worker {}".format(pid)
+        trace_events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}})
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+def save(stream):
+    # writes the trace file with the spans of every process, and the aggregates as a table to stream
+    if not enabled:
+        return
+    import json
+    from tabulate import tabulate
+
+    spans = collect(config.trace)
+    with open(config.trace, "w") as f:
+        json.dump(chrome(spans), f)
+    table = [[name, row["count"], row["p50"] * 1e3, row["p95"] * 1e3, row["max"] * 1e3, row["total"]] for name, row in aggregates(spans).items()]
+    print("\n" + tabulate(table, headers=["Stage", "Count", "p50 (ms)", "p95 (ms)", "Max (ms)", "Total (s)"], floatfmt=".2f"), file=stream)
+    print("trace written to {}".format(config.trace), file=stream)
+
+enable()
@@ -14,3 +14,11 @@ class Translator(object):
 
     def __call__(self, text):
         return self.translate(text)
+
+# the catalog is loaded once per process and language
+_translators = {}
+
+def translator(language):
+    if language not in _translators:
+        _translators[language] = Translator(language)
+    return _translators[language]